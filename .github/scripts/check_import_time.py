@@ -0,0 +1,113 @@
+"""Check that loading the integration stays within its import-time budget."""
+import os
+import subprocess
+import sys
+
+PACKAGE = "custom_components.forsyning"
+# Imported by Home Assistant when setting up, includes the package itself
+MODULE = f"{PACKAGE}.config_flow"
+
+# Home Assistant itself is imported first, so only our own cost is measured
+PRELOAD = [
+    "homeassistant.components.sensor",
+    "homeassistant.config_entries",
+    "homeassistant.helpers.config_validation",
+    "homeassistant.helpers.template",
+]
+
+# Regions looked up after importing, like setting up an entry does
+REGIONS = ["DK1", "DK2"]
+
+# Fills in names const.py doesn't define yet, see scripts/tree_stubs.py
+SCRIPTS = os.path.join(os.path.dirname(__file__), "..", "..", "scripts")
+
+PROBE = """
+import sys
+from time import perf_counter
+
+{preload}
+sys.path.insert(0, {scripts!r})
+import tree_stubs
+tree_stubs.install_const()
+
+import {module}
+from {package}.connectors import Connectors
+
+start = perf_counter()
+for region in {regions}:
+    Connectors().get_connectors(region)
+print("discovery", (perf_counter() - start) * 1000)
+
+for name in sorted(sys.modules):
+    if name.startswith("{package}.connectors."):
+        print("loaded", name)
+"""
+
+
+def check_import_time():
+    """Import the integration, discover connectors and check the budget.
+
+    Fails when importing and discovering takes longer than the budget, or
+    when any connector module gets loaded, as connectors must only be
+    imported once an entry fetches from them.
+    """
+    budget = 500
+    for index, value in enumerate(sys.argv):
+        if value in ["--budget", "-B"]:
+            budget = int(sys.argv[index + 1])
+
+    code = PROBE.format(
+        preload="\n".join(f"import {module}" for module in PRELOAD),
+        package=PACKAGE,
+        module=MODULE,
+        regions=REGIONS,
+        scripts=os.path.abspath(SCRIPTS),
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        check=False,
+        text=True,
+    )
+    if result.returncode:
+        sys.exit(
+            "\n".join(
+                line
+                for line in result.stderr.splitlines()
+                if not line.startswith("import time:")
+            )
+        )
+
+    cumulative = None
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = [part.strip() for part in line.split("|")]
+        if name == MODULE:
+            cumulative = int(total) / 1000
+
+    if cumulative is None:
+        sys.exit(f"{MODULE} was not imported")
+
+    discovery = 0.0
+    loaded = []
+    for line in result.stdout.splitlines():
+        kind, value = line.split(" ", 1)
+        if kind == "discovery":
+            discovery = float(value)
+        elif kind == "loaded":
+            loaded.append(value)
+
+    print(
+        f"Importing {MODULE} took {cumulative:.1f} ms, "
+        f"connector discovery {discovery:.1f} ms (budget {budget} ms)"
+    )
+
+    if loaded:
+        sys.exit(f"Connectors loaded without being used: {', '.join(loaded)}")
+
+    if cumulative + discovery > budget:
+        sys.exit("Import time budget exceeded")
+
+
+check_import_time()
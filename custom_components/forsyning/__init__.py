@@ -1,30 +1,86 @@
 """Adds support for Forsyning sensors."""
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import datetime, timedelta
+import sys
+from collections import namedtuple
+from datetime import date, datetime, time, timedelta
 from functools import partial
 from importlib import import_module
+from time import perf_counter
 
 from aiohttp import ServerDisconnectedError
 from homeassistant.config_entries import SOURCE_IMPORT, ConfigEntry
+from homeassistant.const import CONF_NAME, CONF_PASSWORD, CONF_USERNAME
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.event import async_call_later, async_track_time_change
+from homeassistant.helpers.storage import Store
 from homeassistant.loader import async_get_integration
+from homeassistant.util import dt as dt_utils
+from homeassistant.util import slugify
 from pytz import timezone
 
-from .connectors import Connectors
-from .const import CONF_AREA, DOMAIN, STARTUP, UPDATE_EDS
+from .connectors import Connectors, async_load_connectors
+from .const import (
+    CONF_AREA,
+    CONF_BILLING_DAY,
+    CONF_LEAK_THRESHOLD,
+    CONF_METER,
+    CONF_PRICE_ENTRY,
+    CONF_RESOLUTION,
+    DATA_TRIGGERS,
+    DEFAULT_RESOLUTION,
+    DETECTOR_SAVE_DELAY,
+    DETECTOR_SIGNAL,
+    DETECTOR_STORAGE_VERSION,
+    DOMAIN,
+    EVENT_DETECTOR,
+    HISTORY_DIR,
+    LEGACY_UNIQUE_IDS,
+    MAX_RETRY_MINUTES,
+    PLATFORMS,
+    PREFETCH_HOUR,
+    PREFETCH_MINUTE,
+    RETRY_MINUTES,
+    ROLLUP_SAVE_DELAY,
+    ROLLUP_SIGNAL,
+    ROLLUP_STORAGE_VERSION,
+    STARTUP,
+    UPDATE_EDS,
+)
+from .services import async_setup_services
+from .utils.account import async_get_account_hub, async_release_account_hubs
+from .utils.anomaly import FlowDetector
+from .utils.daybuffer import DayBuffer
+from .utils.history import HistoryStore
+from .utils.metrics import EntryMetrics
+from .utils.normalize import merge_series, normalize_series
+from .utils.query import async_get_range_query
+from .utils.rollups import RollupTracker
+from .utils.tracing import TRACER
+from .utils.triggers import async_get_price_triggers
+from .websocket_api import async_register_websocket_commands
 
 _LOGGER = logging.getLogger(__name__)
 
+MIDNIGHT = time(23, 59, 59)
+
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up the component."""
 
+    integration = await async_get_integration(hass, DOMAIN)
+    _LOGGER.info(STARTUP, integration.version)
+
     hass.data.setdefault(DOMAIN, {})
+    async_register_websocket_commands(hass)
+    async_get_range_query(hass)
+    async_setup_services(hass)
 
     if DOMAIN not in config:
         return True
@@ -47,19 +103,63 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     _LOGGER.debug("Entry options: %s", entry.options)
     result = await _setup(hass, entry)
 
-    hass.async_create_task(
-        hass.config_entries.async_forward_entry_setup(entry, "sensor")
-    )
+    for platform in PLATFORMS:
+        hass.async_create_task(
+            hass.config_entries.async_forward_entry_setup(entry, platform)
+        )
 
     return result
 
 
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Migrate old config entries."""
+    _LOGGER.debug("Migrating %s from version %s", entry.title, entry.version)
+
+    if entry.version == 1:
+        # Change unique_ids to allow multiple instances
+        new_id = slugify(f"{entry.data.get(CONF_NAME)}_{entry.entry_id}")
+        entity_registry = er.async_get(hass)
+        device_registry = dr.async_get(hass)
+
+        for entity in er.async_entries_for_config_entry(
+            entity_registry, entry.entry_id
+        ):
+            device = (
+                device_registry.async_get(entity.device_id)
+                if entity.device_id
+                else None
+            )
+            if device is not None:
+                identifiers = dict(device.identifiers)
+                identifiers[DOMAIN] = new_id
+                _LOGGER.debug(" - Device identifiers after edit: %s", identifiers)
+                device_registry.async_update_device(
+                    device.id, new_identifiers=set(identifiers.items())
+                )
+
+            if entity.unique_id in LEGACY_UNIQUE_IDS:
+                _LOGGER.debug(" - Updating unique_id of %s", entity.entity_id)
+                entity_registry.async_update_entity(
+                    entity.entity_id, new_unique_id=new_id
+                )
+
+        hass.config_entries.async_update_entry(entry, version=2)
+
+    _LOGGER.debug("Migration to version %s successful", entry.version)
+    return True
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_forward_entry_unload(entry, PLATFORMS)
 
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
+        async_release_account_hubs(hass, entry.entry_id)
+        # Keep registered triggers, automations stay attached over a reload
+        triggers = hass.data[DOMAIN].get(DATA_TRIGGERS, {})
+        if not triggers.get(entry.entry_id):
+            triggers.pop(entry.entry_id, None)
         return True
 
     return False
@@ -73,27 +173,41 @@ async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
 
 async def _setup(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Setup the integration using a config entry."""
-    integration = await async_get_integration(hass, DOMAIN)
-    _LOGGER.info(STARTUP, integration.version)
-
+    # Discover connectors off the event loop, APIConnector then uses the cache
+    await async_load_connectors(hass)
     api = APIConnector(
         hass,
         entry.options.get(CONF_AREA) or entry.data.get(CONF_AREA),
         entry.entry_id,
+        billing_day=entry.options.get(CONF_BILLING_DAY, 1),
+        price_entry=entry.options.get(CONF_PRICE_ENTRY),
+        account={
+            CONF_USERNAME: entry.options[CONF_USERNAME],
+            CONF_PASSWORD: entry.options.get(CONF_PASSWORD),
+        }
+        if CONF_USERNAME in entry.options
+        else None,
+        meter=entry.options.get(CONF_METER),
+        leak_threshold=entry.options.get(CONF_LEAK_THRESHOLD),
+        resolution=entry.options.get(CONF_RESOLUTION, DEFAULT_RESOLUTION),
     )
+    await api.async_load_rollups()
+    await api.async_load_detector()
     hass.data[DOMAIN][entry.entry_id] = api
 
     async def new_day(n):  # type: ignore pylint: disable=unused-argument, invalid-name
         """Handle data on new day."""
         _LOGGER.debug("New day function called")
-        api.today = api.tomorrow
-        api.tomorrow = None
-        api._tomorrow_valid = False  # pylint: disable=protected-access
-        api.tomorrow_calculated = False
+        api.rollover()
         async_dispatcher_send(hass, UPDATE_EDS)
 
     async def new_hour(n):  # type: ignore pylint: disable=unused-argument, invalid-name
         """Callback to tell the sensors to update on a new hour."""
+        await api.async_process_elapsed()
+        if n.hour == 0:
+            # new_day handles the update at midnight
+            return
+
         _LOGGER.debug("New hour, updating state")
         async_dispatcher_send(hass, UPDATE_EDS)
 
@@ -103,6 +217,13 @@ async def _setup(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         await api.update()
         async_dispatcher_send(hass, UPDATE_EDS)
 
+    async def prepare_new_day(n):  # type: ignore pylint: disable=unused-argument, invalid-name
+        """Make sure tomorrows dataset is fetched and formatted before midnight."""
+        _LOGGER.debug("Preparing dataset for new day")
+        if not api.tomorrow_valid:
+            await api.update()
+        async_dispatcher_send(hass, UPDATE_EDS)
+
     # Handle dataset updates
     update_tomorrow = async_track_time_change(
         hass,
@@ -120,9 +241,18 @@ async def _setup(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         second=0,
     )
 
+    update_prepare_day = async_track_time_change(
+        hass,
+        prepare_new_day,
+        hour=PREFETCH_HOUR,
+        minute=PREFETCH_MINUTE,
+        second=RANDOM_SECOND,
+    )
+
     update_new_hour = async_track_time_change(hass, new_hour, minute=0, second=0)
 
     api.listeners.append(update_tomorrow)
+    api.listeners.append(update_prepare_day)
     api.listeners.append(update_new_hour)
     api.listeners.append(update_new_day)
 
@@ -132,47 +262,142 @@ async def _setup(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 class APIConnector:
     """An object to store Forsyning data."""
 
-    def __init__(self, hass, region, entry_id) -> None:
+    def __init__(
+        self,
+        hass,
+        region,
+        entry_id,
+        billing_day=1,
+        price_entry=None,
+        account=None,
+        meter=None,
+        leak_threshold=None,
+        resolution=DEFAULT_RESOLUTION,
+    ) -> None:
         """Initialize Forsyning Connector."""
         self._connectors = Connectors()
         self.hass = hass
         self._last_tick = None
         self._tomorrow_valid = False
         self._entry_id = entry_id
+        self._tz = hass.config.time_zone
 
-        self.today = None
-        self.tomorrow = None
+        # Prices as fetched from the connector and as calculated by the sensor
+        self._days = DayBuffer(self._local_date())
+        self._prices = DayBuffer(self._local_date())
         self.today_calculated = False
         self.tomorrow_calculated = False
         self.listeners = []
+        # Last dataset published by the sensor, used by websocket subscribers
+        self.snapshot = None
+        # Sensors using this connector
+        self.sensors = []
+        # Price settings of the sensor, recorded in exports
+        self.price_settings = {}
 
         self.next_retry_delay = RETRY_MINUTES
         self.retry_count = 0
 
         self._client = async_get_clientsession(hass)
         self._region = RegionHandler(region)
-        self._tz = hass.config.time_zone
         self._source = None
+        self.source_module = None
+        self._update_task = None
+        self.history = HistoryStore(hass.config.path(HISTORY_DIR, entry_id))
+        self._stored_metadata = None
+        # Bumped whenever new intervals are stored, used by range queries
+        self.dataset_version = 0
+        self.metrics = EntryMetrics()
+        self.triggers = async_get_price_triggers(hass, entry_id)
+        # Only meter readings, with or without a price entry, are rolled up
+        self.rollups = RollupTracker(billing_day) if meter or price_entry else None
+        self._price_entry = price_entry
+        self._account = account
+        self._resolution = resolution
+        # Missing intervals per day, as (start, end) pairs
+        self.gaps = {}
+        self._meter = meter
+        self._rollup_store = Store(
+            hass, ROLLUP_STORAGE_VERSION, f"{DOMAIN}_rollups_{entry_id}"
+        )
+        self.detector = (
+            FlowDetector(leak_threshold) if leak_threshold is not None else None
+        )
+        self._detector_store = Store(
+            hass, DETECTOR_STORAGE_VERSION, f"{DOMAIN}_detector_{entry_id}"
+        )
 
     async def update(self, dt=None):  # type: ignore pylint: disable=unused-argument,invalid-name
-        """Fetch latest prices from Forsyning API"""
+        """Fetch latest prices from Forsyning API.
+
+        Concurrent callers share a single in-flight fetch for this entry.
+        """
+        if self._update_task is None or self._update_task.done():
+            self.metrics.cache_miss("update")
+            self._update_task = self.hass.async_create_task(self._async_update())
+        else:
+            self.metrics.cache_hit("update")
+            _LOGGER.debug("Update already in progress, waiting for it to finish")
+
+        await asyncio.shield(self._update_task)
+
+    @property
+    def update_in_progress(self) -> bool:
+        """Return True while a fetch is running."""
+        return self._update_task is not None and not self._update_task.done()
+
+    async def _async_update(self) -> None:
+        """Do the actual fetch from the connectors."""
+        with TRACER.span("update", entry=self._entry_id):
+            await self._async_fetch()
+
+    async def _async_import(self, namespace: str):
+        """Import a connector the first time it is used, off the event loop."""
+        name = f"{__name__}{namespace}"
+        if name not in sys.modules:
+            await self.hass.async_add_executor_job(import_module, namespace, __name__)
+
+        return sys.modules[name]
+
+    async def _async_fetch(self) -> None:
+        """Fetch from the first connector delivering data for the region."""
         connectors = self._connectors.get_connectors(self._region.region)
 
         try:
             for endpoint in connectors:
-                module = import_module(endpoint.namespace, __name__)
-                api = module.Connector(self._region, self._client, self._tz)
-                await api.async_get_spotprices()
+                module = await self._async_import(endpoint.namespace)
+                _start = perf_counter()
+                with TRACER.span("fetch", connector=endpoint.module):
+                    api = await self._async_fetch_endpoint(module, endpoint.namespace)
+                if api is None:
+                    continue
+                # Connectors may optionally report parse time and response size
+                self.metrics.record_fetch(
+                    endpoint.module,
+                    perf_counter() - _start,
+                    getattr(api, "parse_time", None),
+                    getattr(api, "bytes_downloaded", None),
+                )
                 if api.today:
-                    self.today = api.today
-                    self.tomorrow = api.tomorrow
+                    with TRACER.span("normalize", entry=self._entry_id):
+                        today = await self._async_normalize(api, api.today, 0)
+                        tomorrow = (
+                            await self._async_normalize(api, api.tomorrow, 1)
+                            if api.tomorrow
+                            else None
+                        )
+                    self.today = today
+                    self.tomorrow = tomorrow
                     _LOGGER.debug(
                         "%s got values from %s (namespace='%s'), breaking loop",
                         self._region.region,
                         endpoint.module,
                         endpoint.namespace,
                     )
-                    self._source = module.SOURCE_NAME
+                    self._source = endpoint.source_name
+                    self.source_module = endpoint.module
+                    written = await self._async_store_history(today + (tomorrow or []))
+                    await self.async_process_elapsed(written)
                     break
 
             self.today_calculated = False
@@ -181,28 +406,11 @@ class APIConnector:
                 self._tomorrow_valid = False
                 self.tomorrow = None
 
-                midnight = datetime.strptime("23:59:59", "%H:%M:%S")
-                refresh = datetime.strptime(self.next_data_refresh, "%H:%M:%S")
-                local_tz = timezone(self.hass.config.time_zone)
-                now = datetime.now().astimezone(local_tz)
-                _LOGGER.debug(
-                    "Now: %s:%s:%s",
-                    f"{now.hour:02d}",
-                    f"{now.minute:02d}",
-                    f"{now.second:02d}",
-                )
-                _LOGGER.debug(
-                    "Refresh: %s:%s:%s",
-                    f"{refresh.hour:02d}",
-                    f"{refresh.minute:02d}",
-                    f"{refresh.second:02d}",
-                )
-                if (
-                    f"{midnight.hour}:{midnight.minute}:{midnight.second}"
-                    > f"{now.hour:02d}:{now.minute:02d}:{now.second:02d}"
-                    and f"{refresh.hour:02d}:{refresh.minute:02d}:{refresh.second:02d}"
-                    < f"{now.hour:02d}:{now.minute:02d}:{now.second:02d}"
-                ):
+                refresh = time(13, RANDOM_MINUTE, RANDOM_SECOND)
+                now = datetime.now(timezone(self._tz)).time().replace(microsecond=0)
+                _LOGGER.debug("Now: %s", now)
+                _LOGGER.debug("Refresh: %s", refresh)
+                if refresh < now < MIDNIGHT:
                     retry_update(self)
                 else:
                     _LOGGER.debug(
@@ -215,6 +423,259 @@ class APIConnector:
             _LOGGER.warning("Server disconnected.")
             retry_update(self)
 
+    async def _async_fetch_endpoint(self, module, namespace: str):
+        """Fetch from a single connector.
+
+        Entries tied to a meter on an account go through the account hub, so
+        all meters of an account share one batched request.
+        """
+        if self._account and hasattr(module, "AccountConnector"):
+            hub = async_get_account_hub(
+                self.hass, module, namespace, self._account, self._tz, self._entry_id
+            )
+            return await hub.async_get_meter(self._meter)
+
+        api = module.Connector(self._region, self._client, self._tz)
+        await api.async_get_spotprices()
+        return api
+
+    async def _async_normalize(self, api, data: list, offset: int) -> list:
+        """Sort, de-duplicate and gap check a day, re-fetching only the gaps.
+
+        Connectors may provide async_get_range(start, end) returning the
+        intervals in a range, which is then used to fill the gaps.
+        """
+        day = self._days.today_date + timedelta(days=offset)
+        series = normalize_series(data, day, self._tz, self._resolution)
+
+        if series.gaps and hasattr(api, "async_get_range"):
+            extra = []
+            for start, end in series.gaps:
+                _LOGGER.debug("Re-fetching missing intervals %s - %s", start, end)
+                extra += await api.async_get_range(start, end) or []
+            series = normalize_series(
+                merge_series(series.data, extra), day, self._tz, self._resolution
+            )
+
+        if series.duplicates:
+            _LOGGER.debug(
+                "Dropped %s duplicate intervals for %s", series.duplicates, day
+            )
+        if series.gaps:
+            _LOGGER.warning(
+                "Missing intervals for %s in %s: %s",
+                day,
+                self._region.region,
+                ", ".join(f"{start} - {end}" for start, end in series.gaps),
+            )
+
+        self.gaps[day] = series.gaps
+        return series.data
+
+    async def _async_store_history(self, data: list) -> list:
+        """Append new intervals to the long term history store.
+
+        Returns the timestamps of the intervals that were new or changed.
+        """
+        rows = [(int(i.hour.timestamp()), i.price) for i in data if i]
+        metadata = self.metadata
+        try:
+            written = await self.hass.async_add_executor_job(self.history.append, rows)
+            # Keep the metadata next to the data, so exports made without
+            # Home Assistant carry the unit, currency and price settings
+            if metadata != self._stored_metadata:
+                await self.hass.async_add_executor_job(
+                    self.history.write_metadata, metadata
+                )
+                self._stored_metadata = metadata
+        except OSError as err:
+            _LOGGER.warning("Couldn't write history for %s: %s", self._entry_id, err)
+            return []
+
+        _LOGGER.debug("Stored %s new intervals in history", len(written))
+        if written:
+            self.dataset_version += 1
+
+        return written
+
+    async def async_load_rollups(self) -> None:
+        """Restore persisted rollup totals."""
+        if self.rollups is not None:
+            self.rollups.load(await self._rollup_store.async_load())
+
+    async def async_process_elapsed(self, written: list | None = None) -> None:
+        """Feed intervals that have started to the rollups and the detector.
+
+        Called every hour and after each fetch, so intervals are picked up as
+        they become current as well as when a connector delivers them late.
+        Intervals since the start of yesterday are always processed, older
+        ones only when they were just written, ie. late or corrected readings.
+        Readings are read back from the history store, ie. as delivered by
+        the connector. Rollups only count each interval once, and the
+        detector skips readings it has already seen.
+        """
+        if self.rollups is None and self.detector is None:
+            return
+
+        now = dt_utils.now()
+        start = int((dt_utils.start_of_local_day() - timedelta(days=1)).timestamp())
+        end = int(now.timestamp()) + 1
+        late = {timestamp for timestamp in written or [] if timestamp < start}
+        first = min(late, default=start)
+        try:
+            rows = await self.hass.async_add_executor_job(
+                self.history.query, first, end
+            )
+            prices = await self._async_unit_prices(first, end)
+        except OSError as err:
+            _LOGGER.warning("Couldn't read history for %s: %s", self._entry_id, err)
+            return
+
+        if late:
+            rows = [row for row in rows if row[0] >= start or row[0] in late]
+
+        if rows:
+            self._update_rollups(rows, prices, now)
+            self._update_detector(rows)
+
+    async def _async_unit_prices(self, start: int, end: int) -> dict:
+        """Return timestamp -> unit price of the linked price entry.
+
+        Prices are the price entry's raw stored prices, calculated with its
+        sensor's settings and in whole currency units (never cents).
+        """
+        price_api = (
+            self.hass.data[DOMAIN].get(self._price_entry) if self._price_entry else None
+        )
+        if price_api is None or not price_api.sensors:
+            return {}
+
+        rows = await self.hass.async_add_executor_job(
+            price_api.history.query, start, end
+        )
+        Interval = namedtuple("Interval", "price hour")
+        prices = await price_api.sensors[0].async_unit_prices(
+            [Interval(value, dt_utils.utc_from_timestamp(ts)) for ts, value in rows]
+        )
+        return {ts: price for (ts, _), price in zip(rows, prices)}
+
+    def _update_rollups(self, rows: list, prices: dict, now: datetime) -> None:
+        """Add new or corrected intervals to the rollup totals."""
+        if self.rollups is None:
+            return
+
+        changed = False
+        for timestamp, consumption in rows:
+            price = prices.get(timestamp)
+            cost = consumption * price if price is not None else None
+            changed |= self.rollups.add(
+                dt_utils.as_local(dt_utils.utc_from_timestamp(timestamp)),
+                consumption,
+                cost,
+            )
+
+        if changed:
+            self.rollups.prune(now)
+            self._rollup_store.async_delay_save(self.rollups.as_dict, ROLLUP_SAVE_DELAY)
+            async_dispatcher_send(self.hass, ROLLUP_SIGNAL.format(self._entry_id))
+
+    async def async_load_detector(self) -> None:
+        """Restore persisted detector state."""
+        if self.detector is not None:
+            self.detector.load(await self._detector_store.async_load())
+
+    def _update_detector(self, rows: list) -> None:
+        """Feed new readings to the leak and anomaly detector."""
+        if self.detector is None:
+            return
+
+        last_seen = self.detector.last_timestamp
+        for timestamp, value in rows:
+            when = dt_utils.as_local(dt_utils.utc_from_timestamp(timestamp))
+            for event, event_data in self.detector.process(when, value):
+                self.hass.bus.async_fire(
+                    EVENT_DETECTOR,
+                    {
+                        "entry_id": self._entry_id,
+                        "type": event,
+                        "hour": when.isoformat(),
+                        **event_data,
+                    },
+                )
+
+        if self.detector.last_timestamp != last_seen:
+            self._detector_store.async_delay_save(
+                self.detector.as_dict, DETECTOR_SAVE_DELAY
+            )
+            async_dispatcher_send(self.hass, DETECTOR_SIGNAL.format(self._entry_id))
+
+    def _local_date(self) -> date:
+        """Return todays date in the configured timezone."""
+        return datetime.now(timezone(self._tz)).date()
+
+    def rollover(self) -> None:
+        """Roll the dataset over to a new day."""
+        self._days.rollover(self._local_date())
+        self._prices.rollover(self._local_date())
+        for day in [day for day in self.gaps if day < self._days.today_date]:
+            self.gaps.pop(day)
+        self.today_calculated = self.tomorrow_calculated and bool(self.today)
+        self.tomorrow_calculated = False
+        self._tomorrow_valid = False
+
+    @property
+    def today(self) -> list | None:
+        """Return dataset for today, calculated prices once available."""
+        return self._prices.offset(0) or self._days.offset(0)
+
+    @today.setter
+    def today(self, data: list | None) -> None:
+        """Store fetched dataset for today."""
+        self._days.set_offset(0, data)
+        self._prices.set_offset(0, None)
+
+    @property
+    def tomorrow(self) -> list | None:
+        """Return dataset for tomorrow, calculated prices once available."""
+        return self._prices.offset(1) or self._days.offset(1)
+
+    @tomorrow.setter
+    def tomorrow(self, data: list | None) -> None:
+        """Store fetched dataset for tomorrow."""
+        self._days.set_offset(1, data)
+        self._prices.set_offset(1, None)
+
+    def set_prices(self, offset: int, data: list) -> None:
+        """Store prices calculated by the sensor, relative to today."""
+        self._prices.set_offset(offset, data)
+
+    @property
+    def yesterday(self) -> list | None:
+        """Return calculated prices for yesterday."""
+        return self._prices.offset(-1)
+
+    @property
+    def days(self) -> DayBuffer:
+        """Return the buffer holding all fetched days."""
+        return self._days
+
+    @property
+    def prices(self) -> DayBuffer:
+        """Return the buffer holding calculated prices of all known days."""
+        return self._prices
+
+    @property
+    def metadata(self) -> dict:
+        """Return metadata describing the stored series."""
+        return {
+            "entry_id": self._entry_id,
+            "region": self._region.region,
+            "currency": self._region.currency.name,
+            "source": self._source,
+            "timezone": self._tz,
+            **self.price_settings,
+        }
+
     @property
     def tomorrow_valid(self) -> bool:
         """Is tomorrows prices valid?"""
@@ -248,16 +709,11 @@ def retry_update(self) -> None:
         self.next_retry_delay,
     )
 
-    local_tz = timezone(self.hass.config.time_zone)
-    now = (datetime.now() + timedelta(minutes=self.next_retry_delay)).astimezone(
-        local_tz
-    )
-    _LOGGER.debug(
-        "Next retry: %s:%s:%s",
-        f"{now.hour:02d}",
-        f"{now.minute:02d}",
-        f"{now.second:02d}",
-    )
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        next_retry = datetime.now(timezone(self.hass.config.time_zone)) + timedelta(
+            minutes=self.next_retry_delay
+        )
+        _LOGGER.debug("Next retry: %s", next_retry.time().replace(microsecond=0))
     async_call_later(
         self.hass,
         timedelta(minutes=self.next_retry_delay),
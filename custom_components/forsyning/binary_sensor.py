@@ -0,0 +1,101 @@
+"""Leak and anomaly binary sensors for Forsyning meters."""
+from __future__ import annotations
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+    BinarySensorEntityDescription,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.util import slugify as util_slugify
+
+from .const import DETECTOR_SIGNAL, DOMAIN
+
+DETECTOR_SENSORS = [
+    BinarySensorEntityDescription(
+        key="leak",
+        name="Leak",
+        device_class=BinarySensorDeviceClass.MOISTURE,
+        icon="mdi:pipe-leak",
+    ),
+    BinarySensorEntityDescription(
+        key="anomaly",
+        name="Abnormal consumption",
+        device_class=BinarySensorDeviceClass.PROBLEM,
+        icon="mdi:chart-bell-curve",
+    ),
+]
+
+
+async def async_setup_entry(hass, config_entry: ConfigEntry, async_add_devices):
+    """Setup binary sensor platform from a config entry."""
+    api = hass.data[DOMAIN][config_entry.entry_id]
+    if api.detector is None:
+        return True
+
+    async_add_devices(
+        [
+            ForsyningDetectorSensor(hass, config_entry, description)
+            for description in DETECTOR_SENSORS
+        ]
+    )
+    return True
+
+
+class ForsyningDetectorSensor(BinarySensorEntity):
+    """Binary sensor reflecting the state of the flow detector."""
+
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config: ConfigEntry,
+        description: BinarySensorEntityDescription,
+    ) -> None:
+        """Initialize detector sensor."""
+        self.entity_description = description
+        self._hass = hass
+        self._entry_id = config.entry_id
+        self._api = hass.data[DOMAIN][config.entry_id]
+        # Same device as the main sensor
+        self._parent_unique_id = util_slugify(
+            f"{config.data.get(CONF_NAME)}_{config.entry_id}"
+        )
+        self._attr_name = f"{config.data.get(CONF_NAME)} {description.name}"
+        self._attr_unique_id = f"{self._parent_unique_id}_{description.key}"
+
+    @property
+    def device_info(self):
+        return {"identifiers": {(DOMAIN, self._parent_unique_id)}}
+
+    @property
+    def is_on(self) -> bool:
+        """Return true if the detector reports a problem."""
+        return getattr(self._api.detector, self.entity_description.key)
+
+    @property
+    def extra_state_attributes(self):
+        """Return detector details."""
+        detector = self._api.detector
+        return {
+            "leak_threshold": detector.leak_threshold,
+            "last_night_min": detector.last_night_min,
+            "zscore": None
+            if detector.last_zscore is None
+            else round(detector.last_zscore, 2),
+        }
+
+    async def async_added_to_hass(self):
+        """Connect to dispatcher listening for detector updates."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self._hass,
+                DETECTOR_SIGNAL.format(self._entry_id),
+                self.async_write_ha_state,
+            )
+        )
@@ -3,6 +3,8 @@ from __future__ import annotations
 
 import logging
 import re
+from collections import namedtuple
+from time import perf_counter
 from typing import Any
 
 import voluptuous as vol
@@ -13,9 +15,19 @@ from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.template import Template
 
-from . import async_setup_entry, async_unload_entry
-from .connectors import Connectors
-from .const import CONF_TEMPLATE, DEFAULT_TEMPLATE, DOMAIN
+from .connectors import async_load_connectors
+from .const import (
+    CONF_RESOLUTION,
+    CONF_TARIFF,
+    CONF_TEMPLATE,
+    DEFAULT_RESOLUTION,
+    DEFAULT_TEMPLATE,
+    DOMAIN,
+    TEMPLATE_MAX_COST,
+    TEMPLATE_PROFILE_RUNS,
+    TEMPLATE_WARN_COST,
+)
+from .utils.tariff import parse_tariff
 
 # from .utils.configuration_schema import (
 #     forsyning_config_option_info_schema,
@@ -25,13 +37,15 @@ from .const import CONF_TEMPLATE, DEFAULT_TEMPLATE, DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
+TemplateProfile = namedtuple("TemplateProfile", "render_time uses_now projected_cost")
+
 
 class ForsyningFlowHandler(config_entries.OptionsFlow):
     """Forsyning config flow options handler."""
 
     def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
         """Initialize Forsyning options flow."""
-        self.connectors = Connectors()
+        self.connectors = None
         self.config_entry = config_entry
         self._errors = {}
         # Cast from MappingProxy to dict to allow update.
@@ -41,6 +55,7 @@ class ForsyningFlowHandler(config_entries.OptionsFlow):
 
     async def async_step_init(self, user_input=None):  # pylint: disable=unused-argument
         """Handle options flow."""
+        self.connectors = await async_load_connectors(self.hass)
         schema = forsyning_config_option_info_schema(self.config_entry.options)
         country = self.config_entry.options.get(
             CONF_COUNTRY,
@@ -66,8 +81,7 @@ class ForsyningFlowHandler(config_entries.OptionsFlow):
 
         async def _do_update(_=None) -> None:
             """Update after settings change."""
-            await async_unload_entry(self.hass, self.config_entry)
-            await async_setup_entry(self.hass, self.config_entry)
+            await self.hass.config_entries.async_reload(self.config_entry.entry_id)
 
         self._errors = {}
 
@@ -84,6 +98,17 @@ class ForsyningFlowHandler(config_entries.OptionsFlow):
                 )
 
             template_ok = await _validate_template(self.hass, user_input[CONF_TEMPLATE])
+            if template_ok:
+                profile = await _profile_template(
+                    self.hass,
+                    user_input[CONF_TEMPLATE],
+                    self.options.get(CONF_RESOLUTION, DEFAULT_RESOLUTION),
+                )
+                template_ok = _template_within_budget(profile, self._errors)
+            if template_ok:
+                template_ok = _validate_tariff(
+                    user_input.get(CONF_TARIFF), self._errors
+                )
             # self._async_abort_entries_match({CONF_NAME: user_input[CONF_NAME]})
             if template_ok:
                 async_call_later(self.hass, 2, _do_update)
@@ -91,7 +116,7 @@ class ForsyningFlowHandler(config_entries.OptionsFlow):
                     title=self.options.get(CONF_NAME),
                     data=self.options,
                 )
-            else:
+            elif not self._errors:
                 self._errors["base"] = "invalid_template"
         schema = forsyning_config_option_info_schema(self.config_entry.options)
         return self.async_show_form(
@@ -108,7 +133,7 @@ class ForsyningFlowHandler(config_entries.OptionsFlow):
 class ForsyningConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Forsyning"""
 
-    VERSION = 1
+    VERSION = 2
     CONNECTION_CLASS = config_entries.CONN_CLASS_CLOUD_POLL
 
     @staticmethod
@@ -121,11 +146,12 @@ class ForsyningConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     def __init__(self) -> None:
         """Initialize the config flow."""
-        self.connectors = Connectors()
+        self.connectors = None
         self._errors = {}
 
     async def async_step_user(self, user_input: Any | None = None) -> FlowResult:
         """Handle the initial config flow step."""
+        self.connectors = await async_load_connectors(self.hass)
         self._errors = {}
 
         if user_input is not None:
@@ -157,6 +183,17 @@ class ForsyningConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 )
 
             template_ok = await _validate_template(self.hass, user_input[CONF_TEMPLATE])
+            if template_ok:
+                profile = await _profile_template(
+                    self.hass,
+                    user_input[CONF_TEMPLATE],
+                    user_input.get(CONF_RESOLUTION, DEFAULT_RESOLUTION),
+                )
+                template_ok = _template_within_budget(profile, self._errors)
+            if template_ok:
+                template_ok = _validate_tariff(
+                    user_input.get(CONF_TARIFF), self._errors
+                )
             self._async_abort_entries_match({CONF_NAME: user_input[CONF_NAME]})
             if template_ok:
                 return self.async_create_entry(
@@ -164,7 +201,7 @@ class ForsyningConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     data={"name": user_input[CONF_NAME]},
                     options=user_input,
                 )
-            else:
+            elif not self._errors:
                 self._errors["base"] = "invalid_template"
 
         schema = forsyning_config_option_info_schema(self.user_input)
@@ -202,3 +239,60 @@ async def _validate_template(hass: HomeAssistant, user_template: Any) -> bool:
         _LOGGER.error(err)
 
     return False
+
+
+async def _profile_template(
+    hass: HomeAssistant, user_template: Any, resolution: int
+) -> TemplateProfile:
+    """Measure how expensive the template is to render for a full refresh."""
+    template = Template(user_template, hass)
+    info = template.async_render_to_info()
+
+    _start = perf_counter()
+    for _ in range(TEMPLATE_PROFILE_RUNS):
+        template.async_render()
+    render_time = (perf_counter() - _start) / TEMPLATE_PROFILE_RUNS
+
+    # Templates using now() are rendered once per interval for today and
+    # tomorrow, others once per day
+    renders = 2 * 24 * 60 // resolution if info.has_time else 2
+    profile = TemplateProfile(render_time, info.has_time, render_time * renders)
+    _LOGGER.debug(
+        "Template renders in %.6f seconds, uses now(): %s, projected cost per refresh: %.3f seconds",  # pylint: disable=line-too-long
+        profile.render_time,
+        profile.uses_now,
+        profile.projected_cost,
+    )
+    return profile
+
+
+def _template_within_budget(profile: TemplateProfile, errors: dict) -> bool:
+    """Check the projected template cost against the time budget."""
+    if profile.projected_cost > TEMPLATE_MAX_COST:
+        _LOGGER.error(
+            "Template would take %.2f seconds per refresh, which is more than the allowed %s seconds",  # pylint: disable=line-too-long
+            profile.projected_cost,
+            TEMPLATE_MAX_COST,
+        )
+        errors["base"] = "template_too_slow"
+        return False
+
+    if profile.projected_cost > TEMPLATE_WARN_COST:
+        _LOGGER.warning(
+            "Template will take about %.2f seconds per refresh, consider simplifying it",  # pylint: disable=line-too-long
+            profile.projected_cost,
+        )
+
+    return True
+
+
+def _validate_tariff(tariff: Any, errors: dict) -> bool:
+    """Validate the declarative tariff definition, if any."""
+    try:
+        parse_tariff(tariff)
+    except ValueError as err:
+        _LOGGER.error(err)
+        errors["base"] = "invalid_tariff"
+        return False
+
+    return True
@@ -1,42 +1,117 @@
-"""Dynamically load all available connectors."""
+"""Discover available connectors from their manifests.
+
+A connector module provides a Connector class taking (region, client, tz)
+with an async_get_spotprices() coroutine that sets "today" and "tomorrow".
+
+Connectors for utility accounts with several meters may also provide an
+AccountConnector taking (account, client, tz) with an async_get_meters()
+coroutine that sets "meters" to a dict of meter_id -> (today, tomorrow).
+Entries configured with an account and meter are then served from one
+batched request per account.
+
+Each connector declares its metadata in a manifest.json next to the code:
+
+    {
+        "source_name": "Aalborg Forsyning",
+        "regions": ["..."],
+        "extra_regions": {},
+        "extra_currencies": {}
+    }
+
+so the connector itself is only imported once an entry actually uses it.
+Connectors without a manifest are imported to read REGIONS, SOURCE_NAME,
+EXTRA_REGIONS and EXTRA_CURRENCIES from the module.
+
+Discovery reads the disk, so Home Assistant code runs it in the executor
+through async_load_connectors() before creating Connectors.
+"""
 from __future__ import annotations
 
+import json
 from collections import namedtuple
 from importlib import import_module
 from logging import getLogger
 from os import listdir
+from os.path import isdir, isfile
 from posixpath import dirname
 
-from genericpath import isdir
+from homeassistant.core import HomeAssistant
 
 from ..const import CURRENCY_LIST, REGIONS
 
 _LOGGER = getLogger(__name__)
 
+MANIFEST = "manifest.json"
 
-class Connectors:
-    """Handle connector modules."""
+Connector = namedtuple("Connector", "module namespace regions source_name")
 
-    def __init__(self):
-        """Initialize connector handler."""
+# Connectors are discovered once per process
+_DISCOVERED = None
+
+
+def _read_manifest(module: str, mod_path: str) -> dict:
+    """Return the metadata of a connector, importing it only without manifest."""
+    manifest = f"{mod_path}/{MANIFEST}"
+    if isfile(manifest):
+        with open(manifest, encoding="UTF-8") as file:
+            return json.load(file)
+
+    _LOGGER.debug("No manifest for connector %s, importing it", module)
+    mod = import_module(f".{module}", __name__)
+    return {
+        "source_name": getattr(mod, "SOURCE_NAME", module),
+        "regions": getattr(mod, "REGIONS", []),
+        "extra_regions": getattr(mod, "EXTRA_REGIONS", {}),
+        "extra_currencies": getattr(mod, "EXTRA_CURRENCIES", {}),
+    }
 
-        self._connectors = []
-        for module in listdir(f"{dirname(__file__)}"):
-            mod_path = f"{dirname(__file__)}/{module}"
-            if isdir(mod_path) and not module.endswith("__pycache__"):
-                Connector = namedtuple("Connector", "module namespace regions")
-                _LOGGER.debug("Adding module %s", module)
-                api_ns = f".{module}"
-                mod = import_module(api_ns, __name__)
-                con = Connector(module, f".connectors{api_ns}", mod.REGIONS)
 
-                if hasattr(mod, "EXTRA_REGIONS"):
-                    REGIONS.update(mod.EXTRA_REGIONS)
+def _discover() -> list:
+    """Find all connectors and register their extra regions and currencies."""
+    connectors = []
+    for module in sorted(listdir(f"{dirname(__file__)}")):
+        mod_path = f"{dirname(__file__)}/{module}"
+        if isdir(mod_path) and not module.endswith("__pycache__"):
+            _LOGGER.debug("Adding module %s", module)
+            manifest = _read_manifest(module, mod_path)
+            connectors.append(
+                Connector(
+                    module,
+                    f".connectors.{module}",
+                    manifest.get("regions", []),
+                    manifest.get("source_name", module),
+                )
+            )
+            REGIONS.update(manifest.get("extra_regions", {}))
+            CURRENCY_LIST.update(manifest.get("extra_currencies", {}))
 
-                if hasattr(mod, "EXTRA_CURRENCIES"):
-                    CURRENCY_LIST.update(mod.EXTRA_CURRENCIES)
+    return connectors
 
-                self._connectors.append(con)
+
+def _load() -> list:
+    """Return the discovered connectors, discovering them on first use."""
+    global _DISCOVERED  # pylint: disable=global-statement
+
+    if _DISCOVERED is None:
+        _DISCOVERED = _discover()
+
+    return _DISCOVERED
+
+
+async def async_load_connectors(hass: HomeAssistant) -> Connectors:
+    """Return a connector handler, discovering connectors in the executor."""
+    if _DISCOVERED is None:
+        await hass.async_add_executor_job(_load)
+
+    return Connectors()
+
+
+class Connectors:
+    """Handle connector modules."""
+
+    def __init__(self):
+        """Initialize connector handler."""
+        self._connectors = _load()
 
     @property
     def connectors(self) -> list:
@@ -49,7 +124,6 @@ class Connectors:
 
         for connector in self._connectors:
             if region in connector.regions:
-                Connector = namedtuple("Connector", "module namespace")
-                connectors.append(Connector(connector.module, connector.namespace))
+                connectors.append(connector)
 
         return connectors
@@ -12,22 +12,85 @@ https://github.com/mtrab/forsyning/issues
 -------------------------------------------------------------------
 """
 
-PLATFORMS = ["sensor"]
+PLATFORMS = ["binary_sensor", "sensor"]
 
+CONF_BILLING_DAY = "billing_day"
 CONF_CURRENCY_IN_CENT = "in_cent"
 CONF_DECIMALS = "decimals"
+CONF_LEAK_THRESHOLD = "leak_threshold"
+CONF_METER = "meter"
+CONF_PRICE_ENTRY = "price_entry"
+CONF_RESOLUTION = "resolution"
+CONF_TARIFF = "tariff"
 CONF_TEMPLATE = "cost_template"
 CONF_VAT = "vat"
 
 DATA = "data"
+DATA_ACCOUNTS = "accounts"
+DATA_PROCESS_POOL = "process_pool"
+DATA_QUERY = "query"
+DATA_RATES = "rates"
+DATA_STARTUP_LIMIT = "startup_limit"
+DATA_TRIGGERS = "triggers"
 DEFAULT_NAME = "Forsyning"
+DEFAULT_RESOLUTION = 60
 DEFAULT_TEMPLATE = "{{0.0|float}}"
 DOMAIN = "Forsyning"
 
+# Number of intervals rendered between yielding to the event loop
+CALCULATION_CHUNK_SIZE = 24
+
+# Linear backoff when the upstream fails, capped at MAX_RETRY_MINUTES
+RETRY_MINUTES = 5
+MAX_RETRY_MINUTES = 60
+
+# Max number of entries doing their first refresh at the same time
+STARTUP_CONCURRENCY = 4
+
+# Directories in the Home Assistant config dir
+EXPORT_DIR = "forsyning_export"
+HISTORY_DIR = "forsyning_history"
+
+# When to make sure tomorrows dataset is ready for the day rollover
+PREFETCH_HOUR = 23
+PREFETCH_MINUTE = 45
+
+# Time budget (seconds) for rendering the cost template for a full refresh
+TEMPLATE_MAX_COST = 2.0
+TEMPLATE_PROFILE_RUNS = 5
+TEMPLATE_WARN_COST = 0.5
+
+RATES_FILE = "forsyning_rates.json"
+
+SERVICE_EXPORT = "export"
+SERVICE_PROFILE_REFRESH = "profile_refresh"
+SERVICE_START_TRACE = "start_trace"
+SERVICE_STOP_TRACE = "stop_trace"
+
 UNIQUE_ID = "unique_id"
 
+# unique_ids used before multiple instances were supported
+LEGACY_UNIQUE_IDS = [
+    "forsyning_West of the great belt",
+    "forsyning_East of the great belt",
+]
+
+METRICS_SIGNAL = "forsyning_metrics_{}"
+ROLLUP_SIGNAL = "forsyning_rollup_{}"
+DETECTOR_SIGNAL = "forsyning_detector_{}"
+
+EVENT_DETECTOR = "forsyning_detector"
+
+DETECTOR_SAVE_DELAY = 30
+DETECTOR_STORAGE_VERSION = 1
+
+ROLLUP_SAVE_DELAY = 30
+ROLLUP_STORAGE_VERSION = 1
+
 UPDATE_SIGNAL = "forsyning_update_{}"
 
+WS_SUBSCRIBE = "forsyning/subscribe"
+
 # # Multiplier mappings
 # UNIT_TO_MULTIPLIER = {"MWh": 0, "kWh": 1000, "Wh": 1000000}
 # MULTIPLIER_TO_UNIT = {0: "MWh", 1000: "kWh", 1000000: "Wh"}
@@ -0,0 +1,126 @@
+"""Device triggers for Forsyning prices."""
+from __future__ import annotations
+
+import voluptuous as vol
+from homeassistant.components.device_automation import DEVICE_TRIGGER_BASE_SCHEMA
+from homeassistant.const import (
+    CONF_ABOVE,
+    CONF_BELOW,
+    CONF_DEVICE_ID,
+    CONF_DOMAIN,
+    CONF_PLATFORM,
+    CONF_TYPE,
+)
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+
+from .const import DOMAIN
+from .utils.triggers import (
+    TRIGGER_CHEAPEST,
+    TRIGGER_PRICE_ABOVE,
+    TRIGGER_PRICE_BELOW,
+    TRIGGER_TYPES,
+    TRIGGER_WINDOW_START,
+    async_get_price_triggers,
+)
+
+CONF_COUNT = "count"
+CONF_HOURS = "hours"
+
+TRIGGER_SCHEMA = DEVICE_TRIGGER_BASE_SCHEMA.extend(
+    {
+        vol.Required(CONF_TYPE): vol.In(TRIGGER_TYPES),
+        vol.Optional(CONF_ABOVE): vol.Coerce(float),
+        vol.Optional(CONF_BELOW): vol.Coerce(float),
+        vol.Optional(CONF_COUNT): cv.positive_int,
+        vol.Optional(CONF_HOURS): cv.positive_int,
+    }
+)
+
+# Which field holds the trigger value for each trigger type
+TRIGGER_FIELDS = {
+    TRIGGER_PRICE_ABOVE: (CONF_ABOVE, vol.Coerce(float)),
+    TRIGGER_PRICE_BELOW: (CONF_BELOW, vol.Coerce(float)),
+    TRIGGER_CHEAPEST: (CONF_COUNT, cv.positive_int),
+    TRIGGER_WINDOW_START: (CONF_HOURS, cv.positive_int),
+}
+
+
+def _get_entry_id(hass: HomeAssistant, device_id: str) -> str | None:
+    """Find the Forsyning config entry a device belongs to."""
+    device = dr.async_get(hass).async_get(device_id)
+    if device is None:
+        return None
+
+    for entry_id in device.config_entries:
+        entry = hass.config_entries.async_get_entry(entry_id)
+        if entry is not None and entry.domain == DOMAIN:
+            return entry_id
+
+    return None
+
+
+async def async_get_triggers(hass: HomeAssistant, device_id: str) -> list[dict]:
+    """List device triggers for Forsyning devices."""
+    if _get_entry_id(hass, device_id) is None:
+        return []
+
+    return [
+        {
+            CONF_PLATFORM: "device",
+            CONF_DOMAIN: DOMAIN,
+            CONF_DEVICE_ID: device_id,
+            CONF_TYPE: trigger_type,
+        }
+        for trigger_type in TRIGGER_TYPES
+    ]
+
+
+async def async_get_trigger_capabilities(
+    hass: HomeAssistant, config: dict
+) -> dict:  # pylint: disable=unused-argument
+    """List the extra field needed by a trigger type."""
+    field, validator = TRIGGER_FIELDS[config[CONF_TYPE]]
+    return {"extra_fields": vol.Schema({vol.Required(field): validator})}
+
+
+async def async_attach_trigger(
+    hass: HomeAssistant,
+    config: dict,
+    action,
+    trigger_info: dict,
+) -> CALLBACK_TYPE:
+    """Attach a trigger."""
+    config = TRIGGER_SCHEMA(config)
+    entry_id = _get_entry_id(hass, config[CONF_DEVICE_ID])
+    if entry_id is None:
+        raise vol.Invalid(f"No Forsyning entry found for {config[CONF_DEVICE_ID]}")
+
+    trigger_type = config[CONF_TYPE]
+    field, _ = TRIGGER_FIELDS[trigger_type]
+    if field not in config:
+        raise vol.Invalid(f"Trigger {trigger_type} requires {field}")
+
+    job = HassJob(action)
+    trigger_data = trigger_info.get("trigger_data", {})
+
+    @callback
+    def _fire(payload: dict) -> None:
+        hass.async_run_hass_job(
+            job,
+            {
+                "trigger": {
+                    **trigger_data,
+                    CONF_PLATFORM: "device",
+                    CONF_DOMAIN: DOMAIN,
+                    CONF_DEVICE_ID: config[CONF_DEVICE_ID],
+                    **payload,
+                    "description": f"Forsyning {trigger_type}",
+                }
+            },
+        )
+
+    return async_get_price_triggers(hass, entry_id).add(
+        trigger_type, config[field], _fire
+    )
@@ -0,0 +1,34 @@
+"""Diagnostics support for Forsyning."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+TO_REDACT = {CONF_PASSWORD, CONF_USERNAME}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    api = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "options": async_redact_data(entry.options, TO_REDACT),
+        "source": api.source,
+        "tomorrow_valid": api.tomorrow_valid,
+        "retry_count": api.retry_count,
+        "days_held": [str(day) for day in api.days.days],
+        "gaps": {
+            str(day): [[str(start), str(end)] for start, end in gaps]
+            for day, gaps in api.gaps.items()
+        },
+        "history_partitions": api.history.index,
+        "metrics": api.metrics.as_dict(),
+    }
@@ -1,13 +1,16 @@
 """Support for Forsyning sensor."""
 from __future__ import annotations
 
+import asyncio
 import logging
 from collections import namedtuple
 from datetime import datetime
+from time import perf_counter
 
 import homeassistant.helpers.config_validation as cv
 from homeassistant.components import sensor
 from homeassistant.components.sensor import (
+    RestoreSensor,
     SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
@@ -15,33 +18,72 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_NAME
-from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers import device_registry as dr
-from homeassistant.helpers import entity_registry as er
-from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import (
+    async_dispatcher_connect,
+    async_dispatcher_send,
+)
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.template import Template, attach
 from homeassistant.util import dt as dt_utils
 from homeassistant.util import slugify as util_slugify
 from jinja2 import pass_context
 
 from .const import (
+    CALCULATION_CHUNK_SIZE,
     CENT_MULTIPLIER,
     CONF_AREA,
     CONF_COUNTRY,
     CONF_CURRENCY_IN_CENT,
     CONF_DECIMALS,
     CONF_PRICETYPE,
+    CONF_TARIFF,
     CONF_TEMPLATE,
     CONF_VAT,
+    DATA_STARTUP_LIMIT,
     DEFAULT_TEMPLATE,
     DOMAIN,
+    METRICS_SIGNAL,
+    ROLLUP_SIGNAL,
+    STARTUP_CONCURRENCY,
     UNIT_TO_MULTIPLIER,
     UPDATE_EDS,
+    UPDATE_SIGNAL,
 )
+from .utils.calculation import PriceSpec, async_calculate_series
+from .utils.currency import async_get_rate_table
 from .utils.regionhandler import RegionHandler
+from .utils.rollups import PERIODS
+from .utils.tariff import parse_tariff
+from .utils.tracing import TRACER
 
 _LOGGER = logging.getLogger(__name__)
 
+# Attributes set by _get_current_price, restored until the first refresh
+RESTORE_ATTRIBUTES = (
+    "current_price",
+    "unit",
+    "currency",
+    "region",
+    "region_code",
+    "tomorrow_valid",
+    "next_data_update",
+    "today",
+    "tomorrow",
+    "raw_today",
+    "raw_tomorrow",
+    "today_min",
+    "today_max",
+    "today_mean",
+    "tomorrow_min",
+    "tomorrow_max",
+    "tomorrow_mean",
+    "yesterday_mean",
+    "last_7_days_mean",
+    "same_hour_last_week",
+    "attribution",
+)
+
 
 async def async_setup_entry(hass, config_entry: ConfigEntry, async_add_devices):
     """Setup sensor platform from a config entry."""
@@ -104,49 +146,73 @@ def _setup(hass, config: ConfigEntry, add_devices):
         state_class=SensorStateClass.MEASUREMENT,
     )
     sens = ForsyningSensor(config, hass, region, this_sensor)
+    metric_sensors = [
+        ForsyningMetricSensor(hass, config, sens.unique_id, description)
+        for description in METRIC_SENSORS
+    ]
+
+    rollup_sensors = (
+        [
+            ForsyningRollupSensor(hass, config, sens.unique_id, period, kind)
+            for period in PERIODS
+            for kind in (ROLLUP_CONSUMPTION, ROLLUP_COST)
+        ]
+        if hass.data[DOMAIN][config.entry_id].rollups is not None
+        else []
+    )
 
-    add_devices([sens])
-
-
-@callback
-def _async_migrate_unique_id(hass: HomeAssistant, entity: str, new_id: str) -> None:
-    """Change unique_ids to allow multiple instances."""
-    _LOGGER.debug("Testing for unique_id")
-    entity_registry = er.async_get(hass)
-    curentity = entity_registry.async_get(entity)
-    if not curentity is None:
-        _LOGGER.debug("- Device_id: %s", curentity.device_id)
-        if not new_id is None:
-            device_registry = dr.async_get(hass)
-            curdevice = device_registry.async_get(curentity.device_id)
-            identifiers = curdevice.identifiers
-            for identifier in identifiers:
-                _LOGGER.debug(" - Identifier found: %s", identifier)
-            _LOGGER.debug(" - Adding new device identifier")
-            device_registry = dr.async_get(hass)
-            curdevice = device_registry.async_get(curentity.device_id)
-            identifiers = curdevice.identifiers
-            tup_dict = dict(identifiers)  # {'hi': 'bye', 'one': 'two'}
-            tup_dict[DOMAIN] = new_id
-            identifiers = tuple(tup_dict.items())  # (('one', 'two'),)
-            for identifier in identifiers:
-                _LOGGER.debug(" - Identifier after edit: %s", identifier)
-            device_registry.async_update_device(
-                curentity.device_id, new_identifiers=identifiers
-            )
-            if curentity.unique_id in [
-                "forsyning_West of the great belt",
-                "forsyning_East of the great belt",
-            ]:
-                _LOGGER.debug(" - Adding extra entity identifier")
-                entity_registry.async_update_entity(entity, new_unique_id=new_id)
-        else:
-            _LOGGER.debug(" - New id not set, skipping")
-    else:
-        _LOGGER.debug("- Check didn't find anything")
-
-
-class ForsyningSensor(SensorEntity):
+    add_devices([sens, *metric_sensors, *rollup_sensors])
+
+
+ROLLUP_CONSUMPTION = "consumption"
+ROLLUP_COST = "cost"
+
+METRIC_SENSORS = [
+    SensorEntityDescription(
+        key="fetch_latency",
+        name="Fetch latency",
+        icon="mdi:timer-outline",
+        native_unit_of_measurement="s",
+    ),
+    SensorEntityDescription(
+        key="bytes_downloaded",
+        name="Bytes downloaded",
+        icon="mdi:download",
+        native_unit_of_measurement="B",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    SensorEntityDescription(
+        key="parse_time",
+        name="Parse time",
+        icon="mdi:timer-outline",
+        native_unit_of_measurement="s",
+    ),
+    SensorEntityDescription(
+        key="format_time",
+        name="Format time",
+        icon="mdi:timer-outline",
+        native_unit_of_measurement="s",
+    ),
+    SensorEntityDescription(
+        key="retry_count",
+        name="Retry count",
+        icon="mdi:restart",
+    ),
+    SensorEntityDescription(
+        key="cache_hit_rate",
+        name="Cache hit rate",
+        icon="mdi:percent",
+    ),
+    SensorEntityDescription(
+        key="state_writes",
+        name="State writes",
+        icon="mdi:pencil",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+]
+
+
+class ForsyningSensor(RestoreSensor):
     """Representation of Forsyning data."""
 
     def __init__(
@@ -165,6 +231,7 @@ class ForsyningSensor(SensorEntity):
         self._cent = config.options.get(CONF_CURRENCY_IN_CENT) or False
         self._area = region.description
         self._currency = hass.config.currency
+        self._rates = async_get_rate_table(hass)
         self._price_type = config.options.get(CONF_PRICETYPE) or config.data.get(
             CONF_PRICETYPE
         )
@@ -183,12 +250,17 @@ class ForsyningSensor(SensorEntity):
             self._vat = 0.25
         else:
             self._vat = 0
+        self._api.price_settings = {
+            "unit": self._price_type,
+            "in_cent": self._cent,
+            "decimals": self._decimals,
+            "vat": self._vat,
+        }
 
         self._entity_id = sensor.ENTITY_ID_FORMAT.format(
             util_slugify(f"{self._attr_name} {self._area}")
         )
         self._unique_id = util_slugify(f"{self._attr_name}_{self._entry_id}")
-        _async_migrate_unique_id(hass, self._entity_id, self._unique_id)
 
         # Holds current price
         self._attr_native_value = None
@@ -230,27 +302,34 @@ class ForsyningSensor(SensorEntity):
                 self._cost_template = cv.template(DEFAULT_TEMPLATE)
 
         attach(self._hass, self._cost_template)
+        # The default template always renders 0.0, no need to render it at all
+        self._template_is_default = self._cost_template.template == DEFAULT_TEMPLATE
+        self._template_uses_now = None
+
+        # Declarative tariff, validated by the config flow
+        self._tariff = parse_tariff(
+            config.options.get(CONF_TARIFF) or config.data.get(CONF_TARIFF)
+        )
 
     async def validate_data(self) -> None:
         """Validate sensor data."""
         _LOGGER.debug("Validating sensor %s", self.name)
 
+        if self._currency != "EUR":
+            await self._rates.async_refresh(self._hass)
+
         # Do we have valid data for today? If not, try fetching new dataset
         if not self._api.today:
             _LOGGER.debug("No sensor data found - calling update")
             await self._api.update()
             if not self._api.today is None:
-                await self._hass.async_add_executor_job(
-                    self._format_list, self._api.today
-                )
+                await self._async_format_list(self._api.days.offset(0))
 
         # Do we have valid data for tomorrow? If we do, calculate prices in local currency
         # If not, set attributes to None
         if self.tomorrow_valid:
             if not self._api.tomorrow_calculated:
-                await self._hass.async_add_executor_job(
-                    self._format_list, self._api.tomorrow, True
-                )
+                await self._async_format_list(self._api.days.offset(1), True)
             self._tomorrow_raw = self._add_raw(self._api.tomorrow)
         else:
             self._api.tomorrow = None
@@ -259,42 +338,70 @@ class ForsyningSensor(SensorEntity):
 
         # If we haven't already calculated todays prices in local currency, do so now
         if not self._api.today_calculated and not self._api.today is None:
-            await self._hass.async_add_executor_job(self._format_list, self._api.today)
-
-        # Update attributes
-        if self._api.today:
-            self._today_raw = self._add_raw(self._api.today)
-
-            self._today_min = self._get_specific("min", self._api.today)
-            self._today_max = self._get_specific("max", self._api.today)
-            self._today_mean = round(
-                self._get_specific("mean", self._api.today), self._decimals
-            )
-            self._tomorrow_min = self._get_specific("min", self._api.tomorrow)
-            self._tomorrow_max = self._get_specific("max", self._api.tomorrow)
+            self._api.metrics.cache_miss("format")
+            await self._async_format_list(self._api.days.offset(0))
+        elif self._api.today_calculated:
+            self._api.metrics.cache_hit("format")
+
+        with TRACER.span("statistics", entry=self._entry_id):
+            # Update attributes
+            if self._api.today:
+                self._today_raw = self._add_raw(self._api.today)
+
+                self._today_min = self._get_specific("min", self._api.today)
+                self._today_max = self._get_specific("max", self._api.today)
+                self._today_mean = round(
+                    self._get_specific("mean", self._api.today), self._decimals
+                )
+                self._tomorrow_min = self._get_specific("min", self._api.tomorrow)
+                self._tomorrow_max = self._get_specific("max", self._api.tomorrow)
 
-        # If we have valid data for tomorrow, then find the mean value
-        if self.tomorrow_valid:
-            self._tomorrow_mean = round(
-                self._get_specific("mean", self._api.tomorrow), self._decimals
-            )
-        else:
-            self._tomorrow_mean = None
+            # If we have valid data for tomorrow, then find the mean value
+            if self.tomorrow_valid:
+                self._tomorrow_mean = round(
+                    self._get_specific("mean", self._api.tomorrow), self._decimals
+                )
+            else:
+                self._tomorrow_mean = None
 
         # Updates price for this hour.
         self._get_current_price()
+        self._api.triggers.evaluate(self._api.today, self._current_interval())
+
+        with TRACER.span("write_state", entity=self.entity_id):
+            self.async_write_ha_state()
+        self._api.metrics.state_writes += 1
+        self._publish_snapshot()
+        async_dispatcher_send(self._hass, METRICS_SIGNAL.format(self._entry_id))
+
+    def _publish_snapshot(self) -> None:
+        """Publish the current dataset to websocket subscribers."""
+        snapshot = {
+            "current_price": self._attr_native_value,
+            "unit": self.unit,
+            "currency": self._currency,
+            "tomorrow_valid": self.tomorrow_valid,
+            "today": self.today,
+            "tomorrow": self.tomorrow,
+            "hours_today": [i["hour"].isoformat() for i in self._today_raw or []],
+            "hours_tomorrow": [i["hour"].isoformat() for i in self._tomorrow_raw or []],
+        }
+        if snapshot == self._api.snapshot:
+            return
 
-        self.async_write_ha_state()
+        self._api.snapshot = snapshot
+        async_dispatcher_send(
+            self._hass, UPDATE_SIGNAL.format(self._entry_id), snapshot
+        )
+
+    @staticmethod
+    def _current_interval() -> datetime:
+        """Return start of the current interval."""
+        return dt_utils.now().replace(minute=0, second=0, microsecond=0)
 
     def _get_current_price(self) -> None:
         """Get price for current hour"""
-        current_state_time = datetime.fromisoformat(
-            dt_utils.now()
-            .replace(microsecond=0)
-            .replace(second=0)
-            .replace(minute=0)
-            .isoformat()
-        )
+        current_state_time = self._current_interval()
         if self._api.today:
             for dataset in self._api.today:
                 if dataset.hour == current_state_time:
@@ -305,6 +412,14 @@ class ForsyningSensor(SensorEntity):
                         self.region.region,
                     )
                     break
+            else:
+                # Don't keep showing the price of a previous interval
+                self._attr_native_value = None
+                _LOGGER.warning(
+                    "No price for %s found in %s",
+                    current_state_time,
+                    self.region.region,
+                )
 
             self._attr_extra_state_attributes = {
                 "current_price": self.state,
@@ -324,6 +439,7 @@ class ForsyningSensor(SensorEntity):
                 "tomorrow_min": self._tomorrow_min or None,
                 "tomorrow_max": self._tomorrow_max or None,
                 "tomorrow_mean": self._tomorrow_mean or None,
+                **self._get_comparisons(current_state_time),
                 "attribution": f"Data sourced from {self._api.source}",
             }
         else:
@@ -334,8 +450,35 @@ class ForsyningSensor(SensorEntity):
         """Connect to dispatcher listening for entity data notifications."""
         await super().async_added_to_hass()
         _LOGGER.debug("Added sensor '%s'", self._entity_id)
-        await self.validate_data()
-        async_dispatcher_connect(self._hass, UPDATE_EDS, self.validate_data)
+        self._api.sensors.append(self)
+        self.async_on_remove(lambda: self._api.sensors.remove(self))
+
+        # Show the last known state until the first refresh has finished
+        last_state = await self.async_get_last_state()
+        last_sensor_data = await self.async_get_last_sensor_data()
+        if last_state is not None and last_sensor_data is not None:
+            self._attr_native_value = last_sensor_data.native_value
+            self._attr_extra_state_attributes = {
+                key: value
+                for key, value in last_state.attributes.items()
+                if key in RESTORE_ATTRIBUTES
+            }
+
+        self.async_on_remove(
+            async_dispatcher_connect(self._hass, UPDATE_EDS, self.validate_data)
+        )
+        first_refresh = self._hass.async_create_task(self._async_first_refresh())
+        # Don't refresh an entity that was removed while waiting for its turn
+        self.async_on_remove(first_refresh.cancel)
+
+    async def _async_first_refresh(self) -> None:
+        """Run the first refresh in the background, limited across entries."""
+        data = self._hass.data[DOMAIN]
+        if DATA_STARTUP_LIMIT not in data:
+            data[DATA_STARTUP_LIMIT] = asyncio.Semaphore(STARTUP_CONCURRENCY)
+
+        async with data[DATA_STARTUP_LIMIT]:
+            await self.validate_data()
 
     @property
     def unique_id(self):
@@ -445,18 +588,33 @@ class ForsyningSensor(SensorEntity):
         """Return mean value for tomorrow."""
         return self._tomorrow_mean
 
-    def _calculate(self, value=None, fake_dt=None) -> float:
+    def _convert(self, values: list) -> list:
+        """Convert a series of prices from EUR to the local currency."""
+        if self._currency == "EUR":
+            return values
+
+        converted = self._rates.convert_series(values, "EUR", self._currency)
+        if converted is None:
+            converted = [
+                self.region.currency.convert(value, self._currency) for value in values
+            ]
+
+        return converted
+
+    def _calculate(self, value=None, fake_dt=None, convert=True, tariff=0.0) -> float:
         """Do price calculations"""
         if value is None:
             value = self._attr_native_value
 
         # Convert currency from EUR
-        if self._currency != "EUR":
-            value = self.region.currency.convert(value, self._currency)
+        if convert and self._currency != "EUR":
+            value = self._convert([value])[0]
 
         # Used to inject the current hour.
         # so template can be simplified using now
-        if fake_dt is not None:
+        if self._template_is_default:
+            template_value = 0.0
+        elif fake_dt is not None:
 
             def faker():
                 def inner(*args, **kwargs):  # type: ignore pylint: disable=unused-argument
@@ -468,6 +626,8 @@ class ForsyningSensor(SensorEntity):
         else:
             template_value = self._cost_template.async_render()
 
+        template_value += tariff
+
         # The api returns prices in MWh
         if self._price_type in ("MWh", "mWh"):
             price = template_value / 1000 + value * float(1 + self._vat)
@@ -481,35 +641,122 @@ class ForsyningSensor(SensorEntity):
 
         return round(price, self._decimals)
 
-    def _format_list(self, data, tomorrow=False) -> None:
+    def _price_spec(self, addition: float) -> PriceSpec:
+        """Return a picklable description of the price calculation."""
+        in_mwh = self._price_type in ("MWh", "mWh")
+        return PriceSpec(
+            vat=self._vat,
+            divisor=1 if in_mwh else UNIT_TO_MULTIPLIER[self._price_type],
+            in_mwh=in_mwh,
+            cent_multiplier=CENT_MULTIPLIER if self._cent else 1,
+            decimals=self._decimals,
+            addition=addition,
+            tariff=self._tariff.definition if self._tariff is not None else None,
+            tz=self._hass.config.time_zone,
+        )
+
+    async def async_calculate_series(self, data: list) -> list:
+        """Calculate local prices for a list of intervals.
+
+        Templates depending on now() have to be rendered for every interval,
+        which is done on the event loop in chunks. Otherwise the template is
+        rendered once and the rest is plain arithmetic, which for large
+        series is offloaded to a process pool.
+        """
+        if self._template_uses_now is None:
+            self._template_uses_now = (
+                not self._template_is_default
+                and self._cost_template.async_render_to_info().has_time
+            )
+
+        prices = self._convert([i.price for i in data])
+
+        if not self._template_uses_now:
+            addition = 0.0
+            if not self._template_is_default:
+                addition = float(self._cost_template.async_render())
+            rows = [(int(i.hour.timestamp()), value) for i, value in zip(data, prices)]
+            return await async_calculate_series(
+                self._hass, self._price_spec(addition), rows
+            )
+
+        hours = [dt_utils.as_local(i.hour) for i in data]
+        if self._tariff is not None:
+            tariffs = self._tariff.lookup_series(hours)
+        else:
+            tariffs = [0.0] * len(hours)
+
+        ret = []
+        for chunk in range(0, len(data), CALCULATION_CHUNK_SIZE):
+            for value, local_hour, tariff in zip(
+                prices[chunk : chunk + CALCULATION_CHUNK_SIZE],
+                hours[chunk : chunk + CALCULATION_CHUNK_SIZE],
+                tariffs[chunk : chunk + CALCULATION_CHUNK_SIZE],
+            ):
+                ret.append(
+                    self._calculate(
+                        value, fake_dt=local_hour, convert=False, tariff=tariff
+                    )
+                )
+            # Let other tasks run between chunks
+            await asyncio.sleep(0)
+
+        return ret
+
+    async def async_unit_prices(self, data: list) -> list:
+        """Calculate local prices in whole currency units, used for costs."""
+        prices = await self.async_calculate_series(data)
+        if self._cent:
+            return [price / CENT_MULTIPLIER for price in prices]
+
+        return prices
+
+    async def _async_format_list(self, data, tomorrow=False) -> None:
         """Format data as list with prices localized."""
-        formatted_pricelist = []
+        with TRACER.span("format", tomorrow=tomorrow, intervals=len(data)):
+            _start = perf_counter()
+            prices = await self.async_calculate_series(data)
 
-        _start = datetime.now().timestamp()
-        for i in data:
             Interval = namedtuple("Interval", "price hour")
-            price = self._calculate(i.price, fake_dt=dt_utils.as_local(i.hour))
-            formatted_pricelist.append(Interval(price, i.hour))
-
-        _stop = datetime.now().timestamp()
-        _ttf = round(_stop - _start, 2)
+            formatted_pricelist = [
+                Interval(price, i.hour) for i, price in zip(data, prices)
+            ]
+            _ttf = perf_counter() - _start
+            self._api.metrics.format_time = round(_ttf, 4)
 
         if tomorrow:
             _calc_for = "TOMORROW"
             self._api.tomorrow_calculated = True
-            self._api.tomorrow = formatted_pricelist
+            self._api.set_prices(1, formatted_pricelist)
         else:
             _calc_for = "TODAY"
             self._api.today_calculated = True
-            self._api.today = formatted_pricelist
+            self._api.set_prices(0, formatted_pricelist)
 
         _LOGGER.debug(
             "Calculation for %s in %s took %s seconds",
             _calc_for,
             self.region.region,
-            _ttf,
+            round(_ttf, 2),
         )
 
+    def _get_comparisons(self, current: datetime) -> dict:
+        """Compare with the prices calculated for earlier days."""
+        prices = self._api.prices
+        yesterday = prices.offset(-1)
+        last_week = [interval for day in prices.last_days(7) for interval in day]
+        same_hour = prices.same_hour_last_week(current)
+
+        return {
+            "yesterday_mean": (
+                round(mean(yesterday), self._decimals) if yesterday else None
+            ),
+            "last_7_days_mean": (
+                round(mean(last_week), self._decimals) if last_week else None
+            ),
+            "same_hour_last_week": same_hour.price if same_hour else None,
+        }
+
     @staticmethod
     def _get_specific(datatype: str, data: list):
         """Get specific values - ie. min, max, mean values"""
@@ -543,3 +790,132 @@ class ForsyningSensor(SensorEntity):
                 return None
         else:
             return None
+
+
+class ForsyningMetricSensor(SensorEntity):
+    """Diagnostic sensor exposing performance metrics for an entry."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config: ConfigEntry,
+        parent_unique_id: str,
+        description: SensorEntityDescription,
+    ) -> None:
+        """Initialize metric sensor."""
+        self.entity_description = description
+        self._hass = hass
+        self._entry_id = config.entry_id
+        self._api = hass.data[DOMAIN][config.entry_id]
+        self._parent_unique_id = parent_unique_id
+        self._attr_name = f"{config.data.get(CONF_NAME)} {description.name}"
+        self._attr_unique_id = f"{parent_unique_id}_{description.key}"
+
+    @property
+    def device_info(self):
+        return {"identifiers": {(DOMAIN, self._parent_unique_id)}}
+
+    @property
+    def native_value(self):
+        """Return the metric value."""
+        metrics = self._api.metrics
+        key = self.entity_description.key
+
+        if key == "retry_count":
+            return self._api.retry_count
+        if key == "cache_hit_rate":
+            rate = metrics.hit_rate()
+            return None if rate is None else round(rate * 100, 1)
+        if key in ("fetch_latency", "parse_time"):
+            values = getattr(metrics, key)
+            return values.get(self._api.source_module) if values else None
+
+        return getattr(metrics, key)
+
+    @property
+    def extra_state_attributes(self):
+        """Return per connector values where available."""
+        key = self.entity_description.key
+        if key in ("fetch_latency", "parse_time"):
+            return {"connectors": getattr(self._api.metrics, key)}
+        if key == "cache_hit_rate":
+            return self._api.metrics.as_dict()["cache_hit_rate"]
+
+        return None
+
+    async def async_added_to_hass(self):
+        """Connect to dispatcher listening for metric updates."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self._hass,
+                METRICS_SIGNAL.format(self._entry_id),
+                self.async_write_ha_state,
+            )
+        )
+
+
+class ForsyningRollupSensor(SensorEntity):
+    """Consumption or cost total for the current rollup period."""
+
+    _attr_should_poll = False
+    _attr_state_class = SensorStateClass.TOTAL
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config: ConfigEntry,
+        parent_unique_id: str,
+        period: str,
+        kind: str,
+    ) -> None:
+        """Initialize rollup sensor."""
+        self._hass = hass
+        self._entry_id = config.entry_id
+        self._api = hass.data[DOMAIN][config.entry_id]
+        self._parent_unique_id = parent_unique_id
+        self._period = period
+        self._kind = kind
+        self._attr_name = f"{config.data.get(CONF_NAME)} {kind} {period}"
+        self._attr_unique_id = f"{parent_unique_id}_{kind}_{period}"
+        self._attr_icon = "mdi:cash" if kind == ROLLUP_COST else "mdi:counter"
+        if kind == ROLLUP_COST:
+            self._attr_native_unit_of_measurement = hass.config.currency
+
+    @property
+    def device_info(self):
+        return {"identifiers": {(DOMAIN, self._parent_unique_id)}}
+
+    @property
+    def native_value(self):
+        """Return the running total for the current period."""
+        consumption, cost = self._api.rollups.totals(
+            self._period, dt_utils.now().date()
+        )
+        value = cost if self._kind == ROLLUP_COST else consumption
+        return round(value, 3)
+
+    @property
+    def last_reset(self):
+        """Return when the current period started."""
+        return dt_utils.start_of_local_day(
+            self._api.rollups.start_of(self._period, dt_utils.now().date())
+        )
+
+    async def async_added_to_hass(self):
+        """Connect to dispatcher listening for rollup updates."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self._hass,
+                ROLLUP_SIGNAL.format(self._entry_id),
+                self.async_write_ha_state,
+            )
+        )
+        # Roll over to the next period even without new data
+        self.async_on_remove(
+            async_dispatcher_connect(self._hass, UPDATE_EDS, self.async_write_ha_state)
+        )
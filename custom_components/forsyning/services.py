@@ -0,0 +1,192 @@
+"""Services for Forsyning."""
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import io
+import logging
+import os
+import pstats
+from datetime import datetime, time
+
+import homeassistant.helpers.config_validation as cv
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_utils
+
+from .const import (
+    DOMAIN,
+    EXPORT_DIR,
+    SERVICE_EXPORT,
+    SERVICE_PROFILE_REFRESH,
+    SERVICE_START_TRACE,
+    SERVICE_STOP_TRACE,
+)
+from .utils.export import FORMAT_CSV, FORMATS, export_series
+from .utils.tracing import TRACER
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTR_END = "end"
+ATTR_ENTRY_ID = "entry_id"
+ATTR_FORMAT = "format"
+ATTR_START = "start"
+ATTR_TOP = "top"
+
+EXPORT_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTRY_ID): cv.string,
+        vol.Required(ATTR_START): cv.date,
+        vol.Required(ATTR_END): cv.date,
+        vol.Optional(ATTR_FORMAT, default=FORMAT_CSV): vol.In(FORMATS),
+    }
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_TOP, default=25): cv.positive_int,
+    }
+)
+
+
+def _get_api(hass: HomeAssistant, entry_id: str):
+    """Get the APIConnector for an entry."""
+    api = hass.data.get(DOMAIN, {}).get(entry_id)
+    if api is None:
+        raise HomeAssistantError(f"Unknown Forsyning entry {entry_id}")
+
+    return api
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register Forsyning services."""
+
+    async def async_export(call: ServiceCall) -> None:
+        """Export stored series for an entry to a file in the config dir."""
+        entry_id = call.data[ATTR_ENTRY_ID]
+        api = _get_api(hass, entry_id)
+        fmt = call.data[ATTR_FORMAT]
+        start = dt_utils.as_local(datetime.combine(call.data[ATTR_START], time.min))
+        end = dt_utils.as_local(datetime.combine(call.data[ATTR_END], time.max))
+
+        directory = hass.config.path(EXPORT_DIR)
+        path = os.path.join(
+            directory,
+            f"{entry_id}_{call.data[ATTR_START]}_{call.data[ATTR_END]}.{fmt}",
+        )
+
+        def _export() -> int:
+            os.makedirs(directory, exist_ok=True)
+            return export_series(
+                api.history,
+                int(start.timestamp()),
+                int(end.timestamp()) + 1,
+                path,
+                fmt,
+                api.metadata,
+            )
+
+        try:
+            rows = await hass.async_add_executor_job(_export)
+        except (OSError, ValueError) as err:
+            raise HomeAssistantError(f"Export failed: {err}") from err
+
+        _LOGGER.info("Exported %s rows to %s", rows, path)
+
+    async def async_start_trace(
+        call: ServiceCall,
+    ) -> None:  # pylint: disable=unused-argument
+        """Start collecting tracing spans."""
+        TRACER.start()
+        _LOGGER.info("Tracing started")
+
+    async def async_stop_trace(
+        call: ServiceCall,
+    ) -> None:  # pylint: disable=unused-argument
+        """Stop tracing and write the spans as a Chrome trace file."""
+        events = TRACER.stop()
+        directory = hass.config.path(EXPORT_DIR)
+        path = os.path.join(
+            directory, f"trace_{dt_utils.now().strftime('%Y%m%d_%H%M%S')}.json"
+        )
+
+        def _write() -> None:
+            os.makedirs(directory, exist_ok=True)
+            TRACER.export(events, path)
+
+        await hass.async_add_executor_job(_write)
+        _LOGGER.info("Wrote %s tracing spans to %s", len(events), path)
+        if TRACER.dropped:
+            _LOGGER.warning(
+                "Trace was capped, %s older spans were discarded", TRACER.dropped
+            )
+
+    profile_lock = asyncio.Lock()
+
+    async def async_profile_refresh(call: ServiceCall) -> None:
+        """Profile one complete refresh cycle for an entry.
+
+        The profiler only runs for the duration of this call and only sees
+        the event loop thread, executor jobs are not included. Only one
+        refresh can be profiled at a time, and a fetch already in flight is
+        allowed to finish first, so the profile covers a fetch of its own
+        rather than waiting on somebody else's.
+        """
+        entry_id = call.data[ATTR_ENTRY_ID]
+        api = _get_api(hass, entry_id)
+
+        if profile_lock.locked():
+            raise HomeAssistantError("A refresh is already being profiled")
+
+        async with profile_lock:
+            if api.update_in_progress:
+                await api.update()
+
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                await api.update()
+                for entity in api.sensors:
+                    await entity.validate_data()
+            finally:
+                profiler.disable()
+
+        directory = hass.config.path(EXPORT_DIR)
+        path = os.path.join(
+            directory,
+            f"profile_{entry_id}_{dt_utils.now().strftime('%Y%m%d_%H%M%S')}.prof",
+        )
+
+        def _dump() -> str:
+            os.makedirs(directory, exist_ok=True)
+            profiler.dump_stats(path)
+
+            try:
+                from pyprof2calltree import (  # pylint: disable=import-outside-toplevel
+                    convert,
+                )
+
+                convert(profiler.getstats(), f"{path}.callgrind")
+            except ImportError:
+                pass
+
+            summary = io.StringIO()
+            pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(
+                call.data[ATTR_TOP]
+            )
+            return summary.getvalue()
+
+        summary = await hass.async_add_executor_job(_dump)
+        _LOGGER.info("Wrote refresh profile to %s\n%s", path, summary)
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_EXPORT, async_export, schema=EXPORT_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE_REFRESH, async_profile_refresh, schema=PROFILE_SCHEMA
+    )
+    hass.services.async_register(DOMAIN, SERVICE_START_TRACE, async_start_trace)
+    hass.services.async_register(DOMAIN, SERVICE_STOP_TRACE, async_stop_trace)
@@ -0,0 +1 @@
+"""Forsyning utilities."""
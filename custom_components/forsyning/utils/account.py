@@ -0,0 +1,113 @@
+"""Account level fetching shared between the meters of an account."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import namedtuple
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util import dt as dt_utils
+
+from ..const import DATA_ACCOUNTS, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Meters refreshing within this window reuse the last batched fetch
+ACCOUNT_REFRESH_WINDOW = timedelta(minutes=2)
+
+MeterData = namedtuple("MeterData", "today tomorrow")
+
+
+class AccountHub:
+    """Fetch all meters and tariffs of an account in one batched request.
+
+    The connector module must provide an AccountConnector taking
+    (account, client, tz), with an async_get_meters() coroutine filling
+    a "meters" dict of meter_id -> (today, tomorrow).
+    """
+
+    def __init__(self, hass: HomeAssistant, module, account: dict, tz: str) -> None:
+        """Initialize account hub."""
+        self._hass = hass
+        self._module = module
+        self._account = account
+        self._tz = tz
+        self._meters = {}
+        self._fetched = None
+        self._task = None
+        self.request_count = 0
+        # Entries using this hub, it is dropped when the last one unloads
+        self.entries = set()
+
+    @property
+    def meters(self) -> list:
+        """Return known meter ids."""
+        return list(self._meters)
+
+    def set_account(self, account: dict) -> None:
+        """Use new credentials, dropping data fetched with the old ones."""
+        if account == self._account:
+            return
+
+        self._account = account
+        self._fetched = None
+
+    async def _async_fetch(self) -> None:
+        """Fetch all meters of the account."""
+        api = self._module.AccountConnector(
+            self._account, async_get_clientsession(self._hass), self._tz
+        )
+        self.request_count += 1
+        await api.async_get_meters()
+        self._meters = {
+            meter_id: MeterData(*series) for meter_id, series in api.meters.items()
+        }
+        self._fetched = dt_utils.utcnow()
+        _LOGGER.debug("Fetched %s meters for account", len(self._meters))
+
+    async def async_get_meter(self, meter_id: str) -> MeterData | None:
+        """Return data for a meter, refreshing the account if needed."""
+        fresh = (
+            self._fetched is not None
+            and dt_utils.utcnow() - self._fetched < ACCOUNT_REFRESH_WINDOW
+        )
+        if not fresh:
+            if self._task is None or self._task.done():
+                self._task = self._hass.async_create_task(self._async_fetch())
+            await asyncio.shield(self._task)
+
+        return self._meters.get(meter_id)
+
+
+@callback
+def async_get_account_hub(
+    hass: HomeAssistant,
+    module,
+    namespace: str,
+    account: dict,
+    tz: str,
+    entry_id: str,
+) -> AccountHub:
+    """Get the hub shared by all entries using the same account."""
+    hubs = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_ACCOUNTS, {})
+    key = (namespace, account.get("username"))
+    if key not in hubs:
+        hubs[key] = AccountHub(hass, module, account, tz)
+
+    hub = hubs[key]
+    # Credentials may have been changed in the options of this entry
+    hub.set_account(account)
+    hub.entries.add(entry_id)
+    return hub
+
+
+@callback
+def async_release_account_hubs(hass: HomeAssistant, entry_id: str) -> None:
+    """Detach an entry from its hubs, removing hubs no longer used."""
+    hubs = hass.data.get(DOMAIN, {}).get(DATA_ACCOUNTS, {})
+    for key, hub in list(hubs.items()):
+        hub.entries.discard(entry_id)
+        if not hub.entries:
+            hubs.pop(key)
@@ -0,0 +1,153 @@
+"""Online leak and anomaly detection on meter readings.
+
+Every reading is processed once, in O(1), and the detector state is small
+enough to persist between restarts:
+
+- Continuous flow: number of consecutive readings above the leak threshold.
+- Minimum night flow: lowest reading during the night, a night where the
+  flow never dropped below the leak threshold indicates a leak.
+- Per hour-of-day EWMA baselines, flagging readings with a z-score above
+  the anomaly threshold.
+"""
+from __future__ import annotations
+
+import math
+from datetime import datetime
+
+EVENT_ANOMALY = "anomaly"
+EVENT_LEAK_CLEARED = "leak_cleared"
+EVENT_LEAK_STARTED = "leak_started"
+
+DEFAULT_ALPHA = 0.1
+DEFAULT_CONTINUOUS_HOURS = 24
+DEFAULT_Z_THRESHOLD = 4.0
+MIN_SAMPLES = 14
+NIGHT_END = 5
+NIGHT_START = 1
+
+
+class FlowDetector:
+    """Streaming detector for a single meter."""
+
+    def __init__(
+        self,
+        leak_threshold: float,
+        continuous_hours: int = DEFAULT_CONTINUOUS_HOURS,
+        z_threshold: float = DEFAULT_Z_THRESHOLD,
+        alpha: float = DEFAULT_ALPHA,
+    ) -> None:
+        """Initialize detector."""
+        self.leak_threshold = leak_threshold
+        self.continuous_hours = continuous_hours
+        self.z_threshold = z_threshold
+        self.alpha = alpha
+
+        self.last_timestamp = None
+        self.leak = False
+        self.anomaly = False
+        self.last_zscore = None
+        self.continuous_since = None
+        self.night_min = None
+        self.last_night_min = None
+        # hour of day -> [count, mean, variance]
+        self._baselines = {}
+
+    def _update_baseline(self, hour: int, value: float) -> float | None:
+        """Update the EWMA baseline for an hour, returns z-score before update."""
+        count, mean, variance = self._baselines.get(str(hour), [0, value, 0.0])
+
+        zscore = None
+        if count >= MIN_SAMPLES and variance > 0:
+            zscore = (value - mean) / math.sqrt(variance)
+
+        if count == 0:
+            mean, variance = value, 0.0
+        else:
+            diff = value - mean
+            increment = self.alpha * diff
+            mean += increment
+            variance = (1 - self.alpha) * (variance + diff * increment)
+
+        self._baselines[str(hour)] = [count + 1, mean, variance]
+        return zscore
+
+    def process(self, when: datetime, value: float) -> list:
+        """Process a reading in local time, returns list of (event, data)."""
+        timestamp = int(when.timestamp())
+        if self.last_timestamp is not None and timestamp <= self.last_timestamp:
+            return []
+        self.last_timestamp = timestamp
+
+        events = []
+        was_leaking = self.leak
+
+        # Continuous flow
+        if value > self.leak_threshold:
+            if self.continuous_since is None:
+                self.continuous_since = timestamp
+        else:
+            self.continuous_since = None
+
+        continuous = (
+            self.continuous_since is not None
+            and timestamp - self.continuous_since >= self.continuous_hours * 3600
+        )
+
+        # Minimum night flow, evaluated when the night is over
+        if NIGHT_START <= when.hour < NIGHT_END:
+            self.night_min = (
+                value if self.night_min is None else min(self.night_min, value)
+            )
+        elif self.night_min is not None:
+            self.last_night_min = self.night_min
+            self.night_min = None
+
+        night_leak = (
+            self.last_night_min is not None
+            and self.last_night_min > self.leak_threshold
+        )
+
+        self.leak = continuous or (night_leak and value > self.leak_threshold)
+        if self.leak and not was_leaking:
+            events.append((EVENT_LEAK_STARTED, {"value": value}))
+        elif was_leaking and not self.leak:
+            events.append((EVENT_LEAK_CLEARED, {"value": value}))
+
+        # Deviation from the usual consumption at this hour
+        self.last_zscore = self._update_baseline(when.hour, value)
+        self.anomaly = (
+            self.last_zscore is not None and abs(self.last_zscore) > self.z_threshold
+        )
+        if self.anomaly:
+            events.append(
+                (EVENT_ANOMALY, {"value": value, "zscore": round(self.last_zscore, 2)})
+            )
+
+        return events
+
+    def as_dict(self) -> dict:
+        """Return state for persisting."""
+        return {
+            "last_timestamp": self.last_timestamp,
+            "leak": self.leak,
+            "anomaly": self.anomaly,
+            "last_zscore": self.last_zscore,
+            "continuous_since": self.continuous_since,
+            "night_min": self.night_min,
+            "last_night_min": self.last_night_min,
+            "baselines": self._baselines,
+        }
+
+    def load(self, data: dict | None) -> None:
+        """Restore persisted state."""
+        if not data:
+            return
+
+        self.last_timestamp = data.get("last_timestamp")
+        self.leak = data.get("leak", False)
+        self.anomaly = data.get("anomaly", False)
+        self.last_zscore = data.get("last_zscore")
+        self.continuous_since = data.get("continuous_since")
+        self.night_min = data.get("night_min")
+        self.last_night_min = data.get("last_night_min")
+        self._baselines = data.get("baselines", {})
@@ -0,0 +1,105 @@
+"""Numeric price calculation for templates that don't depend on now().
+
+Once the cost template has been rendered, pricing a series is plain
+arithmetic described by a picklable PriceSpec, so it needs neither the
+entity nor the event loop. Bulk recalculations, like pricing weeks of
+history for the rollup costs, are handed to a process pool.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import multiprocessing
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import HomeAssistant, callback
+
+from ..const import DATA_PROCESS_POOL, DOMAIN
+from .tariff import Tariff
+
+# Series at least this long are calculated in the process pool
+BULK_THRESHOLD = 1000
+PROCESS_POOL_WORKERS = 2
+
+PriceSpec = namedtuple(
+    "PriceSpec",
+    "vat divisor in_mwh cent_multiplier decimals addition tariff tz",
+)
+
+
+@lru_cache(maxsize=16)
+def _compile_tariff(definition: str) -> Tariff:
+    """Compile a tariff definition, once per process."""
+    return Tariff(json.loads(definition))
+
+
+def calculate_series(spec: PriceSpec, rows: list) -> list:
+    """Calculate prices for (timestamp, value) rows, value in local currency.
+
+    spec.tariff is the tariff definition or None, spec.addition the
+    rendered cost template.
+
+    Must match ForsyningSensor._calculate for templates not depending on now().
+    """
+    if spec.tariff:
+        zone = ZoneInfo(spec.tz)
+        tariff = _compile_tariff(json.dumps(spec.tariff, sort_keys=True, default=str))
+        tariffs = tariff.lookup_series(
+            [datetime.fromtimestamp(timestamp, zone) for timestamp, _ in rows]
+        )
+    else:
+        tariffs = [0.0] * len(rows)
+
+    factor = float(1 + spec.vat)
+    ret = []
+    for (_, value), extra in zip(rows, tariffs):
+        extra += spec.addition
+        if spec.in_mwh:
+            price = extra / 1000 + value * factor
+        else:
+            price = extra + value / spec.divisor * factor
+
+        ret.append(round(price * spec.cent_multiplier, spec.decimals))
+
+    return ret
+
+
+@callback
+def _async_get_pool(hass: HomeAssistant) -> ProcessPoolExecutor:
+    """Get the process pool shared by all entries, created on first use.
+
+    Workers are spawned rather than forked, as forking Home Assistant's
+    multithreaded process isn't safe.
+    """
+    data = hass.data.setdefault(DOMAIN, {})
+    if DATA_PROCESS_POOL not in data:
+        pool = ProcessPoolExecutor(
+            max_workers=PROCESS_POOL_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        data[DATA_PROCESS_POOL] = pool
+
+        @callback
+        def _shutdown(event):  # pylint: disable=unused-argument
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _shutdown)
+
+    return data[DATA_PROCESS_POOL]
+
+
+async def async_calculate_series(
+    hass: HomeAssistant, spec: PriceSpec, rows: list
+) -> list:
+    """Calculate a series, using the process pool for bulk recalculations."""
+    if len(rows) < BULK_THRESHOLD:
+        return calculate_series(spec, rows)
+
+    return await asyncio.get_running_loop().run_in_executor(
+        _async_get_pool(hass), calculate_series, spec, rows
+    )
@@ -0,0 +1,141 @@
+"""Exchange rate handling shared by all Forsyning entries."""
+from __future__ import annotations
+
+import json
+import logging
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from os.path import isfile
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_utils
+
+from ..const import DATA_RATES, DOMAIN, RATES_FILE
+
+_LOGGER = logging.getLogger(__name__)
+
+RATES_TTL = timedelta(days=1)
+# Retry sooner when loading the rates failed
+RATES_RETRY_TTL = timedelta(minutes=15)
+
+
+class RateSource(ABC):
+    """Base class for exchange rate sources.
+
+    A source returns a tuple of the base currency and a dict of rates, where
+    each rate is the amount of that currency matching one unit of base.
+    """
+
+    @abstractmethod
+    async def async_fetch(self, hass: HomeAssistant) -> tuple[str, dict]:
+        """Fetch exchange rates."""
+
+
+class FileRateSource(RateSource):
+    """Read exchange rates from a local JSON file.
+
+    Format: {"base": "EUR", "rates": {"DKK": 7.44, "SEK": 11.2}}
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize file source."""
+        self._path = path
+
+    def _load(self) -> tuple[str, dict]:
+        """Load rates from disk."""
+        if not isfile(self._path):
+            _LOGGER.debug("No exchange rate file found at %s", self._path)
+            return "EUR", {}
+
+        with open(self._path, encoding="UTF-8") as ratefile:
+            data = json.load(ratefile)
+
+        return data.get("base", "EUR"), {
+            currency: float(rate) for currency, rate in data.get("rates", {}).items()
+        }
+
+    async def async_fetch(self, hass: HomeAssistant) -> tuple[str, dict]:
+        """Fetch exchange rates from file."""
+        return await hass.async_add_executor_job(self._load)
+
+
+class ExchangeRateTable:
+    """Cached table of exchange rates, refreshed once per day."""
+
+    def __init__(self, source: RateSource, ttl: timedelta = RATES_TTL) -> None:
+        """Initialize rate table."""
+        self._source = source
+        self._ttl = ttl
+        self._base = "EUR"
+        self._rates = {}
+        self._pairs = {}
+        self._expires = None
+
+    @property
+    def expired(self) -> bool:
+        """Is the table due for a refresh?"""
+        return self._expires is None or dt_utils.utcnow() >= self._expires
+
+    @property
+    def expires(self) -> datetime | None:
+        """Return when the table expires."""
+        return self._expires
+
+    async def async_refresh(self, hass: HomeAssistant, force: bool = False) -> None:
+        """Reload rates from the source if the table has expired."""
+        if not force and not self.expired:
+            return
+
+        try:
+            self._base, self._rates = await self._source.async_fetch(hass)
+        except (OSError, ValueError) as err:
+            # Keep whatever rates we have, and try again shortly
+            _LOGGER.warning("Couldn't load exchange rates: %s", err)
+            self._expires = dt_utils.utcnow() + RATES_RETRY_TTL
+            return
+
+        self._pairs = {}
+        self._expires = dt_utils.utcnow() + self._ttl
+        _LOGGER.debug(
+            "Exchange rates loaded for %s, expires %s", self._base, self._expires
+        )
+
+    def rate(self, from_currency: str, to_currency: str) -> float | None:
+        """Return the rate converting from one currency to another."""
+        pair = (from_currency, to_currency)
+        if pair in self._pairs:
+            return self._pairs[pair]
+
+        if from_currency == to_currency:
+            rate = 1.0
+        else:
+            rates = {**self._rates, self._base: 1.0}
+            if from_currency in rates and to_currency in rates:
+                rate = rates[to_currency] / rates[from_currency]
+            else:
+                rate = None
+
+        self._pairs[pair] = rate
+        return rate
+
+    def convert_series(
+        self, values: list, from_currency: str, to_currency: str
+    ) -> list | None:
+        """Convert a whole series in one go, returns None if rate is unknown."""
+        rate = self.rate(from_currency, to_currency)
+        if rate is None:
+            return None
+
+        return [value * rate for value in values]
+
+
+@callback
+def async_get_rate_table(hass: HomeAssistant) -> ExchangeRateTable:
+    """Get the exchange rate table shared by all entries."""
+    data = hass.data.setdefault(DOMAIN, {})
+    if DATA_RATES not in data:
+        data[DATA_RATES] = ExchangeRateTable(
+            FileRateSource(hass.config.path(RATES_FILE))
+        )
+
+    return data[DATA_RATES]
@@ -0,0 +1,91 @@
+"""Bounded ring buffer holding datasets indexed by date."""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+
+DEFAULT_DAYS_KEPT = 7
+
+
+class DayBuffer:
+    """Keep the last N days of data plus any future days, indexed by date.
+
+    The buffer is anchored at a "today" pointer. Rolling over to a new day only
+    moves the pointer and drops the day falling out of the window, so the data
+    for yesterday (and earlier) stays available without refetching.
+    """
+
+    def __init__(self, today: date, days_kept: int = DEFAULT_DAYS_KEPT) -> None:
+        """Initialize the buffer."""
+        self._days = {}
+        self._today = today
+        self._days_kept = days_kept
+
+    @property
+    def today_date(self) -> date:
+        """Return the date the buffer currently considers today."""
+        return self._today
+
+    def get(self, day: date) -> list | None:
+        """Get dataset for a specific date."""
+        return self._days.get(day)
+
+    def set(self, day: date, data: list | None) -> None:
+        """Store (or clear) the dataset for a specific date."""
+        if data is None:
+            self._days.pop(day, None)
+            return
+
+        if day < self._today - timedelta(days=self._days_kept):
+            return
+
+        self._days[day] = data
+
+    def offset(self, days: int) -> list | None:
+        """Get dataset relative to today, ie. -1 for yesterday."""
+        return self._days.get(self._today + timedelta(days=days))
+
+    def set_offset(self, days: int, data: list | None) -> None:
+        """Store dataset relative to today."""
+        self.set(self._today + timedelta(days=days), data)
+
+    def rollover(self, today: date | None = None) -> None:
+        """Move the today pointer, defaults to the next day."""
+        self._today = today or self._today + timedelta(days=1)
+        cutoff = self._today - timedelta(days=self._days_kept)
+        for day in [day for day in self._days if day < cutoff]:
+            self._days.pop(day)
+
+    def last_days(self, days: int) -> list:
+        """Return datasets for the last N days, oldest first, excluding today."""
+        ret = []
+        for offset in range(-days, 0):
+            data = self.offset(offset)
+            if data:
+                ret.append(data)
+
+        return ret
+
+    def interval_at(self, when: datetime):
+        """Find the interval starting at a specific point in time."""
+        data = self._days.get(when.date())
+        if not data:
+            return None
+
+        for interval in data:
+            if interval.hour == when:
+                return interval
+
+        return None
+
+    def same_hour_last_week(self, when: datetime):
+        """Return the interval exactly one week before the given time."""
+        return self.interval_at(when - timedelta(days=7))
+
+    @property
+    def days(self) -> list:
+        """Return all dates held in the buffer, sorted."""
+        return sorted(self._days)
+
+    def __len__(self) -> int:
+        """Return number of days held."""
+        return len(self._days)
@@ -0,0 +1,117 @@
+"""Export stored series to compact files.
+
+Data is streamed one partition at a time from the history store, so memory
+use stays flat regardless of the exported range. Like the history store,
+this module has no Home Assistant dependencies.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import struct
+
+FORMAT_CSV = "csv.gz"
+FORMAT_NPY = "npy"
+FORMAT_PARQUET = "parquet"
+FORMATS = [FORMAT_CSV, FORMAT_NPY, FORMAT_PARQUET]
+
+NPY_MAGIC = b"\x93NUMPY\x01\x00"
+NPY_ROW = struct.Struct("<qd")
+
+
+def export_series(
+    store, start: int, end: int, path: str, fmt: str = FORMAT_CSV, metadata=None
+) -> int:
+    """Export rows in [start, end) from a history store, returns row count."""
+    metadata = metadata or {}
+
+    if fmt == FORMAT_CSV:
+        return _export_csv(store, start, end, path, metadata)
+    if fmt == FORMAT_NPY:
+        return _export_npy(store, start, end, path, metadata)
+    if fmt == FORMAT_PARQUET:
+        return _export_parquet(store, start, end, path, metadata)
+
+    raise ValueError(f"Unsupported export format '{fmt}'")
+
+
+def _export_csv(store, start: int, end: int, path: str, metadata: dict) -> int:
+    """Export as gzipped CSV with metadata as leading comment lines."""
+    rows = 0
+    with gzip.open(path, "wt", encoding="UTF-8", newline="") as csvfile:
+        for key, value in sorted(metadata.items()):
+            csvfile.write(f"# {key}: {value}\n")
+        csvfile.write("timestamp,value\n")
+
+        for timestamps, values in store.iter_range(start, end):
+            csvfile.write(
+                "".join(
+                    f"{timestamp},{value!r}\n"
+                    for timestamp, value in zip(timestamps, values)
+                )
+            )
+            rows += len(timestamps)
+
+    return rows
+
+
+def _export_npy(store, start: int, end: int, path: str, metadata: dict) -> int:
+    """Export as a NumPy structured array, metadata goes in a JSON sidecar.
+
+    The .npy header has to state the row count, so the range is counted
+    before the rows are streamed.
+    """
+    rows = sum(len(timestamps) for timestamps, _ in store.iter_range(start, end))
+
+    header = (
+        "{'descr': [('timestamp', '<i8'), ('value', '<f8')], "
+        f"'fortran_order': False, 'shape': ({rows},), }}"
+    )
+    # Header incl. magic, length and trailing newline must align to 64 bytes
+    padding = 64 - (len(NPY_MAGIC) + 2 + len(header) + 1) % 64
+    header = header + " " * padding + "\n"
+
+    with open(path, "wb") as npyfile:
+        npyfile.write(NPY_MAGIC)
+        npyfile.write(struct.pack("<H", len(header)))
+        npyfile.write(header.encode("latin1"))
+
+        for timestamps, values in store.iter_range(start, end):
+            npyfile.write(
+                b"".join(
+                    NPY_ROW.pack(timestamp, value)
+                    for timestamp, value in zip(timestamps, values)
+                )
+            )
+
+    with open(f"{path}.json", "w", encoding="UTF-8") as metafile:
+        json.dump(metadata, metafile, indent=4, sort_keys=True)
+
+    return rows
+
+
+def _export_parquet(store, start: int, end: int, path: str, metadata: dict) -> int:
+    """Export as Parquet, requires pyarrow."""
+    try:
+        import pyarrow  # pylint: disable=import-outside-toplevel
+        from pyarrow import parquet  # pylint: disable=import-outside-toplevel
+    except ImportError as err:
+        raise ValueError("Parquet export requires pyarrow to be installed") from err
+
+    schema = pyarrow.schema(
+        [("timestamp", pyarrow.int64()), ("value", pyarrow.float64())],
+        metadata={key: str(value) for key, value in metadata.items()},
+    )
+
+    rows = 0
+    with parquet.ParquetWriter(path, schema) as writer:
+        for timestamps, values in store.iter_range(start, end):
+            writer.write_table(
+                pyarrow.table(
+                    {"timestamp": list(timestamps), "value": list(values)},
+                    schema=schema,
+                )
+            )
+            rows += len(timestamps)
+
+    return rows
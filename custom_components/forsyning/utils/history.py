@@ -0,0 +1,272 @@
+"""Date partitioned columnar store for long term series data.
+
+Each partition covers one calendar month (UTC) and consists of two fixed
+width column files, one with int64 epoch timestamps and one with float64
+values. A small JSON index keeps first/last timestamp and row count per
+partition so range queries only open the partitions they need. Columns are
+memory mapped when read, so nothing is loaded into memory up front.
+New rows are appended, while late or corrected rows rewrite their
+partition into new column files that replace the old ones. A column file
+is never shrunk in place, as that would invalidate it for anyone who has
+it mapped. Writes and the copying of slices out of the mapped columns are
+serialized by a lock per store.
+
+This module has no Home Assistant dependencies, so it can be used from
+scripts as well.
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+
+INDEX_FILE = "index.json"
+METADATA_FILE = "metadata.json"
+TS_SUFFIX = ".ts"
+VALUE_SUFFIX = ".val"
+
+
+def _partition_key(timestamp: int) -> str:
+    """Return the partition a timestamp belongs to."""
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m")
+
+
+class HistoryStore:
+    """Columnar history store for a single series."""
+
+    def __init__(self, path: str) -> None:
+        """Initialize the store, nothing is read until needed."""
+        self._path = path
+        self._index = None
+        self._lock = threading.RLock()
+
+    @property
+    def path(self) -> str:
+        """Return the store directory."""
+        return self._path
+
+    @property
+    def index(self) -> dict:
+        """Return the partition index."""
+        with self._lock:
+            if self._index is None:
+                self._index = self._load_index()
+
+            return self._index
+
+    @property
+    def first_timestamp(self) -> int | None:
+        """Return the oldest timestamp held."""
+        return min((part["first"] for part in self.index.values()), default=None)
+
+    @property
+    def last_timestamp(self) -> int | None:
+        """Return the newest timestamp held."""
+        return max((part["last"] for part in self.index.values()), default=None)
+
+    def _file(self, key: str, suffix: str) -> str:
+        """Return path to a column file."""
+        return os.path.join(self._path, f"{key}{suffix}")
+
+    def _load_index(self) -> dict:
+        """Load the partition index from disk."""
+        try:
+            with open(
+                os.path.join(self._path, INDEX_FILE), encoding="UTF-8"
+            ) as indexfile:
+                return json.load(indexfile)
+        except FileNotFoundError:
+            return {}
+
+    def _save_index(self) -> None:
+        """Atomically write the partition index."""
+        tmp = os.path.join(self._path, f"{INDEX_FILE}.tmp")
+        with open(tmp, "w", encoding="UTF-8") as indexfile:
+            json.dump(self._index, indexfile, sort_keys=True)
+        os.replace(tmp, os.path.join(self._path, INDEX_FILE))
+
+    def read_metadata(self) -> dict:
+        """Return the metadata describing the series, empty if none is stored."""
+        try:
+            with open(
+                os.path.join(self._path, METADATA_FILE), encoding="UTF-8"
+            ) as metafile:
+                return json.load(metafile)
+        except FileNotFoundError:
+            return {}
+
+    def write_metadata(self, metadata: dict) -> None:
+        """Atomically store the metadata describing the series."""
+        os.makedirs(self._path, exist_ok=True)
+        tmp = os.path.join(self._path, f"{METADATA_FILE}.tmp")
+        with open(tmp, "w", encoding="UTF-8") as metafile:
+            json.dump(metadata, metafile, indent=4, sort_keys=True)
+        os.replace(tmp, os.path.join(self._path, METADATA_FILE))
+
+    def _read_partition(self, key: str, count: int) -> tuple[array, array]:
+        """Read both columns of a partition."""
+        timestamps = array("q")
+        values = array("d")
+        with open(self._file(key, TS_SUFFIX), "rb") as tsfile:
+            timestamps.fromfile(tsfile, count)
+        with open(self._file(key, VALUE_SUFFIX), "rb") as valfile:
+            values.fromfile(valfile, count)
+
+        return timestamps, values
+
+    def _extend_partition(self, key: str, timestamps: array, values: array) -> None:
+        """Append rows to the end of the columns of a partition."""
+        for suffix, column in ((TS_SUFFIX, timestamps), (VALUE_SUFFIX, values)):
+            with open(self._file(key, suffix), "ab") as colfile:
+                column.tofile(colfile)
+
+    def _replace_partition(self, key: str, timestamps: array, values: array) -> None:
+        """Write the columns of a partition to new files replacing the old ones."""
+        for suffix, column in ((TS_SUFFIX, timestamps), (VALUE_SUFFIX, values)):
+            tmp = f"{self._file(key, suffix)}.tmp"
+            with open(tmp, "wb") as colfile:
+                column.tofile(colfile)
+            os.replace(tmp, self._file(key, suffix))
+
+    def _merge(self, key: str, meta: dict, rows: list) -> list:
+        """Merge rows into an existing partition, returns timestamps changed.
+
+        The tail from the oldest incoming row is merged and the partition
+        rewritten, so filled gaps and upstream corrections end up in their
+        right place.
+        """
+        timestamps, values = self._read_partition(key, meta["count"])
+        position = bisect_left(timestamps, rows[0][0])
+        tail = dict(zip(timestamps[position:], values[position:]))
+        changed = [(ts, value) for ts, value in rows if tail.get(ts) != value]
+        if not changed:
+            return []
+
+        tail.update(changed)
+        merged = sorted(tail.items())
+        self._replace_partition(
+            key,
+            timestamps[:position] + array("q", [ts for ts, _ in merged]),
+            values[:position] + array("d", [value for _, value in merged]),
+        )
+        meta["first"] = timestamps[0] if position else merged[0][0]
+        meta["last"] = merged[-1][0]
+        meta["count"] = position + len(merged)
+
+        return [ts for ts, _ in changed]
+
+    def append(self, rows) -> list:
+        """Store (timestamp, value) rows, returns the timestamps written.
+
+        Rows newer than everything in their partition are appended. Older
+        rows fill gaps or replace the stored value of their timestamp.
+        """
+        partitions = {}
+        for timestamp, value in sorted(rows):
+            # Later rows for the same timestamp win
+            partitions.setdefault(_partition_key(int(timestamp)), {})[
+                int(timestamp)
+            ] = float(value)
+
+        if not partitions:
+            return []
+
+        with self._lock:
+            os.makedirs(self._path, exist_ok=True)
+            index = self.index
+            written = []
+
+            for key, part_rows in partitions.items():
+                part_rows = sorted(part_rows.items())
+                meta = index.get(key)
+                if meta and meta["count"] and part_rows[0][0] <= meta["last"]:
+                    written += self._merge(key, meta, part_rows)
+                    continue
+
+                timestamps = array("q", [ts for ts, _ in part_rows])
+                values = array("d", [value for _, value in part_rows])
+                position = meta["count"] if meta else 0
+                if position:
+                    self._extend_partition(key, timestamps, values)
+                else:
+                    self._replace_partition(key, timestamps, values)
+
+                index[key] = {
+                    "first": meta["first"] if position else timestamps[0],
+                    "last": timestamps[-1],
+                    "count": position + len(timestamps),
+                }
+                written += timestamps.tolist()
+
+            if written:
+                self._save_index()
+
+        return written
+
+    def partitions(self, start: int, end: int) -> list:
+        """Return partition keys overlapping the range [start, end)."""
+        with self._lock:
+            return [
+                key
+                for key, meta in sorted(self.index.items())
+                if meta["count"] and meta["first"] < end and meta["last"] >= start
+            ]
+
+    def _slice(self, key: str, start: int, end: int) -> tuple[array, array] | None:
+        """Copy the rows in [start, end) out of the mapped columns of a partition."""
+        with open(self._file(key, TS_SUFFIX), "rb") as tsfile, open(
+            self._file(key, VALUE_SUFFIX), "rb"
+        ) as valfile:
+            with mmap.mmap(
+                tsfile.fileno(), 0, access=mmap.ACCESS_READ
+            ) as ts_map, mmap.mmap(
+                valfile.fileno(), 0, access=mmap.ACCESS_READ
+            ) as val_map:
+                ts_col = memoryview(ts_map).cast("q")
+                val_col = memoryview(val_map).cast("d")
+                try:
+                    low = bisect_left(ts_col, start)
+                    high = bisect_left(ts_col, end)
+                    if low < high:
+                        return array("q", ts_col[low:high]), array(
+                            "d", val_col[low:high]
+                        )
+                finally:
+                    ts_col.release()
+                    val_col.release()
+
+        return None
+
+    def iter_range(self, start: int, end: int):
+        """Yield (timestamps, values) arrays per partition for [start, end).
+
+        Only the requested slice of each partition is copied out of the
+        memory mapped columns. The lock is held while copying, never while
+        the caller consumes a slice.
+        """
+        for key in self.partitions(start, end):
+            with self._lock:
+                columns = self._slice(key, start, end)
+            if columns is not None:
+                yield columns
+
+    def query(self, start: int, end: int) -> list:
+        """Return all (timestamp, value) rows in [start, end)."""
+        rows = []
+        for timestamps, values in self.iter_range(start, end):
+            rows.extend(zip(timestamps, values))
+
+        return rows
+
+    def value_at(self, timestamp: int) -> float | None:
+        """Return the value stored for an exact timestamp."""
+        for timestamps, values in self.iter_range(timestamp, timestamp + 1):
+            pos = bisect_right(timestamps, timestamp) - 1
+            if pos >= 0 and timestamps[pos] == timestamp:
+                return values[pos]
+
+        return None
@@ -0,0 +1,58 @@
+"""Per entry performance metrics."""
+from __future__ import annotations
+
+
+class EntryMetrics:
+    """Collect timing and counters for a single config entry."""
+
+    def __init__(self) -> None:
+        """Initialize metrics."""
+        self.fetch_latency = {}
+        self.parse_time = {}
+        self.bytes_downloaded = 0
+        self.format_time = None
+        self.state_writes = 0
+        self._cache = {}
+
+    def record_fetch(
+        self, connector: str, latency: float, parse_time=None, size=None
+    ) -> None:
+        """Record a fetch from a connector."""
+        self.fetch_latency[connector] = round(latency, 4)
+        if parse_time is not None:
+            self.parse_time[connector] = round(parse_time, 4)
+        if size:
+            self.bytes_downloaded += size
+
+    def cache_hit(self, cache: str) -> None:
+        """Count a cache hit."""
+        self._cache.setdefault(cache, [0, 0])[0] += 1
+
+    def cache_miss(self, cache: str) -> None:
+        """Count a cache miss."""
+        self._cache.setdefault(cache, [0, 0])[1] += 1
+
+    def hit_rate(self, cache: str | None = None) -> float | None:
+        """Return hit rate for one cache, or all caches combined."""
+        if cache is None:
+            hits = sum(counts[0] for counts in self._cache.values())
+            total = sum(sum(counts) for counts in self._cache.values())
+        else:
+            hits, misses = self._cache.get(cache, [0, 0])
+            total = hits + misses
+
+        if not total:
+            return None
+
+        return round(hits / total, 4)
+
+    def as_dict(self) -> dict:
+        """Return all metrics."""
+        return {
+            "fetch_latency": self.fetch_latency,
+            "parse_time": self.parse_time,
+            "bytes_downloaded": self.bytes_downloaded,
+            "format_time": self.format_time,
+            "state_writes": self.state_writes,
+            "cache_hit_rate": {cache: self.hit_rate(cache) for cache in self._cache},
+        }
@@ -0,0 +1,75 @@
+"""Normalize series from connectors before they reach the sensors."""
+from __future__ import annotations
+
+from collections import namedtuple
+from datetime import date, datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+NormalizedSeries = namedtuple("NormalizedSeries", "data gaps duplicates")
+
+
+def day_bounds(day: date, tz: str) -> tuple[int, int]:
+    """Return UTC timestamps for the start and end of a local day."""
+    zone = ZoneInfo(tz)
+    start = datetime.combine(day, time.min, tzinfo=zone)
+    end = datetime.combine(day + timedelta(days=1), time.min, tzinfo=zone)
+    return int(start.timestamp()), int(end.timestamp())
+
+
+def normalize_series(
+    data: list, day: date, tz: str, resolution: int = 60
+) -> NormalizedSeries:
+    """Sort, de-duplicate and check a days worth of intervals for gaps.
+
+    The expected number of intervals follows the actual length of the local
+    day, so DST days have 23 or 25 hours. Gaps are returned as a list of
+    (start, end) UTC datetimes.
+    """
+    by_timestamp = {}
+    duplicates = 0
+    for interval in data or []:
+        if not interval:
+            continue
+        timestamp = int(interval.hour.timestamp())
+        if timestamp in by_timestamp:
+            duplicates += 1
+        # Later entries win, connectors append corrections at the end
+        by_timestamp[timestamp] = interval
+
+    ordered = [by_timestamp[timestamp] for timestamp in sorted(by_timestamp)]
+
+    start, end = day_bounds(day, tz)
+    step = resolution * 60
+    gaps = []
+    gap_start = None
+    for timestamp in range(start, end, step):
+        if timestamp not in by_timestamp:
+            if gap_start is None:
+                gap_start = timestamp
+        elif gap_start is not None:
+            gaps.append((gap_start, timestamp))
+            gap_start = None
+    if gap_start is not None:
+        gaps.append((gap_start, end))
+
+    return NormalizedSeries(
+        ordered,
+        [
+            (
+                datetime.fromtimestamp(gap[0], tz=timezone.utc),
+                datetime.fromtimestamp(gap[1], tz=timezone.utc),
+            )
+            for gap in gaps
+        ],
+        duplicates,
+    )
+
+
+def merge_series(data: list, extra: list) -> list:
+    """Merge re-fetched intervals into a series, extra wins on conflicts."""
+    merged = {int(interval.hour.timestamp()): interval for interval in data if interval}
+    for interval in extra or []:
+        if interval:
+            merged[int(interval.hour.timestamp())] = interval
+
+    return [merged[timestamp] for timestamp in sorted(merged)]
@@ -0,0 +1,162 @@
+"""In-process range queries over the stored series of an entry.
+
+Other integrations and scripts running inside Home Assistant can query the
+series without parsing sensor attributes:
+
+    query = hass.data["Forsyning"]["query"]
+    result = await query.async_query(entry_id, start, end, 60, "mean")
+
+Results are typed arrays (int64 epoch timestamps, float64 values) in the
+unit delivered by the connector, ie. before VAT, templates and tariffs.
+They are memoized per dataset version and shared between callers, so they
+must be treated as read-only.
+"""
+from __future__ import annotations
+
+import asyncio
+from array import array
+from collections import OrderedDict, namedtuple
+from datetime import datetime
+
+from homeassistant.core import HomeAssistant, callback
+
+from ..const import DATA_QUERY, DOMAIN
+
+QUERY_CACHE_SIZE = 128
+
+AGGREGATIONS = {
+    "mean": lambda values: sum(values) / len(values),
+    "min": min,
+    "max": max,
+    "sum": sum,
+    "first": lambda values: values[0],
+    "last": lambda values: values[-1],
+}
+
+RangeResult = namedtuple("RangeResult", "timestamps values version")
+
+
+def aggregate(
+    timestamps, values, start: int, resolution: int | None, aggregation: str
+) -> tuple[array, array]:
+    """Aggregate sorted rows into buckets of resolution minutes from start.
+
+    Buckets without any rows are left out.
+    """
+    if not resolution:
+        return array("q", timestamps), array("d", values)
+
+    func = AGGREGATIONS[aggregation]
+    step = resolution * 60
+    out_ts = array("q")
+    out_val = array("d")
+    bucket = None
+    members = []
+    for timestamp, value in zip(timestamps, values):
+        key = start + (timestamp - start) // step * step
+        if key != bucket:
+            if members:
+                out_ts.append(bucket)
+                out_val.append(func(members))
+            bucket, members = key, []
+        members.append(value)
+
+    if members:
+        out_ts.append(bucket)
+        out_val.append(func(members))
+
+    return out_ts, out_val
+
+
+def read_range(
+    store, start: int, end: int, resolution: int | None, aggregation: str
+) -> tuple[array, array]:
+    """Read [start, end) from a history store and aggregate it."""
+    timestamps = array("q")
+    values = array("d")
+    for part_ts, part_val in store.iter_range(start, end):
+        timestamps.extend(part_ts)
+        values.extend(part_val)
+
+    return aggregate(timestamps, values, start, resolution, aggregation)
+
+
+def _timestamp(value) -> int:
+    """Return epoch seconds for a datetime or a number."""
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+
+    return int(value)
+
+
+class RangeQuery:
+    """Memoized range queries over all entries."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the query API."""
+        self._hass = hass
+        self._cache = OrderedDict()
+        self._pending = {}
+
+    async def async_query(
+        self,
+        entry_id: str,
+        start,
+        end,
+        resolution: int | None = None,
+        aggregation: str = "mean",
+    ) -> RangeResult:
+        """Return the series of an entry for [start, end).
+
+        start and end are aware datetimes or epoch seconds. resolution is the
+        bucket size in minutes, None returns the stored intervals as is.
+        """
+        api = self._hass.data.get(DOMAIN, {}).get(entry_id)
+        if api is None or not hasattr(api, "history"):
+            raise ValueError(f"Unknown entry {entry_id}")
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(f"Unknown aggregation {aggregation}")
+
+        key = (entry_id, _timestamp(start), _timestamp(end), resolution, aggregation)
+        version = api.dataset_version
+
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] is api and cached[1].version == version:
+            self._cache.move_to_end(key)
+            return cached[1]
+
+        # Identical queries running at the same time share one read
+        pending = self._pending.get((key, version))
+        if pending is None:
+            pending = self._hass.async_create_task(
+                self._async_compute(api, key, version)
+            )
+            self._pending[(key, version)] = pending
+            pending.add_done_callback(lambda _: self._pending.pop((key, version), None))
+
+        return await asyncio.shield(pending)
+
+    async def _async_compute(self, api, key: tuple, version: int) -> RangeResult:
+        """Read and aggregate a range, then memoize it."""
+        _, start, end, resolution, aggregation = key
+        timestamps, values = await self._hass.async_add_executor_job(
+            read_range, api.history, start, end, resolution, aggregation
+        )
+        result = RangeResult(timestamps, values, version)
+
+        self._cache[key] = (api, result)
+        self._cache.move_to_end(key)
+        while len(self._cache) > QUERY_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+        return result
+
+
+@callback
+def async_get_range_query(hass: HomeAssistant) -> RangeQuery:
+    """Get the query API shared by all entries."""
+    data = hass.data.setdefault(DOMAIN, {})
+    if DATA_QUERY not in data:
+        data[DATA_QUERY] = RangeQuery(hass)
+
+    return data[DATA_QUERY]
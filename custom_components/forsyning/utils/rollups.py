@@ -0,0 +1,111 @@
+"""Incrementally maintained consumption and cost rollups."""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+
+PERIOD_DAY = "day"
+PERIOD_WEEK = "week"
+PERIOD_MONTH = "month"
+PERIOD_BILLING = "billing"
+PERIODS = [PERIOD_DAY, PERIOD_WEEK, PERIOD_MONTH, PERIOD_BILLING]
+
+# How long individual interval contributions are kept for corrections
+CORRECTION_DAYS = 45
+
+
+def period_start(period: str, day: date, billing_day: int = 1) -> date:
+    """Return the first date of the period containing day."""
+    if period == PERIOD_DAY:
+        return day
+    if period == PERIOD_WEEK:
+        return day - timedelta(days=day.weekday())
+    if period == PERIOD_MONTH:
+        return day.replace(day=1)
+    if period == PERIOD_BILLING:
+        if day.day >= billing_day:
+            return day.replace(day=billing_day)
+        previous = day.replace(day=1) - timedelta(days=1)
+        return previous.replace(day=billing_day)
+
+    raise ValueError(f"Unknown period '{period}'")
+
+
+class RollupTracker:
+    """Running totals per period, updated in O(1) per interval.
+
+    The contribution of every interval is remembered for a while, so late
+    or corrected data only adjusts the buckets that interval belongs to.
+    """
+
+    def __init__(self, billing_day: int = 1) -> None:
+        """Initialize tracker."""
+        self._billing_day = min(max(int(billing_day), 1), 28)
+        self._buckets = {}
+        self._contributions = {}
+
+    def _keys(self, day: date) -> list:
+        """Return the bucket keys an interval on day belongs to."""
+        return [
+            f"{period}:{period_start(period, day, self._billing_day).isoformat()}"
+            for period in PERIODS
+        ]
+
+    def add(self, when: datetime, consumption: float, cost: float | None) -> bool:
+        """Add or correct a single interval, returns True if totals changed."""
+        timestamp = str(int(when.timestamp()))
+        contribution = [consumption, cost]
+        previous = self._contributions.get(timestamp)
+        if previous == contribution:
+            return False
+
+        for key in self._keys(when.date()):
+            totals = self._buckets.setdefault(key, [0.0, 0.0])
+            if previous is not None:
+                totals[0] -= previous[0]
+                totals[1] -= previous[1] or 0.0
+            totals[0] += consumption
+            totals[1] += cost or 0.0
+
+        self._contributions[timestamp] = contribution
+        return True
+
+    def totals(self, period: str, day: date) -> tuple[float, float]:
+        """Return (consumption, cost) for the period containing day."""
+        key = f"{period}:{period_start(period, day, self._billing_day).isoformat()}"
+        consumption, cost = self._buckets.get(key, [0.0, 0.0])
+        return consumption, cost
+
+    def start_of(self, period: str, day: date) -> date:
+        """Return the first date of the period containing day."""
+        return period_start(period, day, self._billing_day)
+
+    def prune(self, now: datetime) -> None:
+        """Forget old contributions and buckets no longer current."""
+        cutoff = now - timedelta(days=CORRECTION_DAYS)
+        cutoff_ts = cutoff.timestamp()
+        self._contributions = {
+            timestamp: contribution
+            for timestamp, contribution in self._contributions.items()
+            if int(timestamp) >= cutoff_ts
+        }
+
+        oldest = min(
+            period_start(period, cutoff.date(), self._billing_day) for period in PERIODS
+        ).isoformat()
+        self._buckets = {
+            key: totals
+            for key, totals in self._buckets.items()
+            if key.split(":", 1)[1] >= oldest
+        }
+
+    def as_dict(self) -> dict:
+        """Return state for persisting."""
+        return {"buckets": self._buckets, "contributions": self._contributions}
+
+    def load(self, data: dict | None) -> None:
+        """Restore persisted state."""
+        if not data:
+            return
+
+        self._buckets = data.get("buckets", {})
+        self._contributions = data.get("contributions", {})
@@ -0,0 +1,194 @@
+"""Declarative tariffs compiled to a fast interval lookup.
+
+A tariff is defined as YAML (or JSON):
+
+    fixed: 0.05              # added to every interval
+    bands:
+      - price: 0.45
+        start: "17:00"
+        end: "21:00"
+        weekdays: [0, 1, 2, 3, 4]   # Monday = 0, optional
+        months: [10, 11, 12, 1, 2, 3]  # season, optional
+        valid_from: 2024-01-01      # optional
+        valid_to: 2024-12-31        # optional
+
+Bands matching the same time add up. A band ending at or before its start
+wraps past midnight, its weekdays, months and validity then refer to the day
+it starts on. For each kind of day the bands are compiled once into
+a sorted table of segment starts and prices, and every interval is then
+priced with a binary search in that table.
+"""
+from __future__ import annotations
+
+import re
+from bisect import bisect_right
+from datetime import date, datetime, time, timedelta
+
+import yaml
+
+# YAML 1.1 reads unquoted 17:00 as the sexagesimal integer 1020, so times
+# that look like HH:MM are kept as strings instead
+_TIME = re.compile(r"^[0-9]{1,2}:[0-5][0-9]$")
+
+
+class _TariffLoader(yaml.SafeLoader):  # pylint: disable=too-many-ancestors
+    """Safe loader keeping unquoted HH:MM times as strings."""
+
+
+_TariffLoader.yaml_implicit_resolvers = {
+    first: ([("tag:yaml.org,2002:str", _TIME)] if first.isdigit() else [])
+    + list(resolvers)
+    for first, resolvers in yaml.SafeLoader.yaml_implicit_resolvers.items()
+}
+
+ALL_WEEKDAYS = (0, 1, 2, 3, 4, 5, 6)
+ALL_MONTHS = (1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12)
+MINUTES_PER_DAY = 24 * 60
+
+
+def _minutes(value) -> int:
+    """Convert "HH:MM" (or 24:00) to minutes after midnight."""
+    if not isinstance(value, str):
+        raise ValueError(f'Invalid time {value!r}, times are written as "HH:MM"')
+
+    try:
+        hours, minutes = value.split(":")
+        hours, minutes = int(hours), int(minutes)
+    except ValueError as err:
+        raise ValueError(f"Invalid time '{value}'") from err
+
+    total = hours * 60 + minutes
+    if not 0 <= minutes < 60 or not 0 <= total <= MINUTES_PER_DAY:
+        raise ValueError(f"Invalid time '{value}'")
+    return total
+
+
+def _date(value) -> date | None:
+    """Convert a date value."""
+    if value is None or isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value))
+
+
+class TariffBand:
+    """A single time band of a tariff."""
+
+    def __init__(self, definition: dict) -> None:
+        """Validate and initialize a band."""
+        self.price = float(definition["price"])
+        self.start = _minutes(definition.get("start", "00:00"))
+        self.end = _minutes(definition.get("end", "24:00"))
+        self.weekdays = tuple(definition.get("weekdays", ALL_WEEKDAYS))
+        self.months = tuple(definition.get("months", ALL_MONTHS))
+        self.valid_from = _date(definition.get("valid_from"))
+        self.valid_to = _date(definition.get("valid_to"))
+
+        if not set(self.weekdays) <= set(ALL_WEEKDAYS):
+            raise ValueError(f"Invalid weekdays {self.weekdays}")
+        if not set(self.months) <= set(ALL_MONTHS):
+            raise ValueError(f"Invalid months {self.months}")
+
+    def applies_to(self, day: date) -> bool:
+        """Is the band in effect on a given day?"""
+        return (
+            day.weekday() in self.weekdays
+            and day.month in self.months
+            and (self.valid_from is None or day >= self.valid_from)
+            and (self.valid_to is None or day <= self.valid_to)
+        )
+
+    def segments(self, day: date) -> tuple:
+        """Return the (start, end) minute ranges the band covers on a day.
+
+        A band wrapping midnight covers the evening of the days it applies to
+        and the morning of the days after.
+        """
+        if self.start < self.end:
+            return ((self.start, self.end),) if self.applies_to(day) else ()
+
+        ret = ()
+        if self.end and self.applies_to(day - timedelta(days=1)):
+            ret += ((0, self.end),)
+        if self.applies_to(day):
+            ret += ((self.start, MINUTES_PER_DAY),)
+        return ret
+
+
+class Tariff:
+    """Compiled tariff."""
+
+    def __init__(self, definition: dict) -> None:
+        """Validate the definition, tables are built on first use."""
+        self.definition = definition
+        self.fixed = float(definition.get("fixed", 0.0))
+        self.bands = [TariffBand(band) for band in definition.get("bands", [])]
+        self._tables = {}
+
+    def _table(self, day: date) -> tuple[list, list]:
+        """Return (segment starts, prices) for a day, compiled once per kind of day."""
+        active = tuple(
+            (index, segments)
+            for index, band in enumerate(self.bands)
+            if (segments := band.segments(day))
+        )
+        if active not in self._tables:
+            changes = {0: 0.0}
+            for index, segments in active:
+                band = self.bands[index]
+                for start, end in segments:
+                    changes[start] = changes.get(start, 0.0) + band.price
+                    changes[end] = changes.get(end, 0.0) - band.price
+
+            starts = []
+            prices = []
+            running = self.fixed
+            for minute in sorted(changes):
+                running += changes[minute]
+                if minute < MINUTES_PER_DAY:
+                    starts.append(minute)
+                    prices.append(round(running, 6))
+            self._tables[active] = (starts, prices)
+
+        return self._tables[active]
+
+    def price_at(self, when: datetime) -> float:
+        """Return tariff for the interval starting at a local time."""
+        starts, prices = self._table(when.date())
+        return prices[bisect_right(starts, when.hour * 60 + when.minute) - 1]
+
+    def lookup_series(self, hours: list) -> list:
+        """Return tariff for each (local, sorted) interval start in one pass."""
+        ret = []
+        current_day = None
+        for when in hours:
+            if when.date() != current_day:
+                current_day = when.date()
+                starts, prices = self._table(current_day)
+            ret.append(prices[bisect_right(starts, when.hour * 60 + when.minute) - 1])
+
+        return ret
+
+
+def parse_tariff(text: str | dict | None) -> Tariff | None:
+    """Parse and compile a tariff definition, raises ValueError if invalid."""
+    if text in (None, ""):
+        return None
+
+    try:
+        definition = (
+            yaml.load(text, Loader=_TariffLoader) if isinstance(text, str) else text
+        )
+        if not isinstance(definition, dict):
+            raise ValueError("Tariff must be a mapping")
+        return Tariff(definition)
+    except (yaml.YAMLError, KeyError, TypeError) as err:
+        raise ValueError(f"Invalid tariff: {err}") from err
+
+
+def describe(tariff: Tariff, day: date) -> list:
+    """Return the compiled table for a day as (start time, price) pairs."""
+    starts, prices = tariff._table(day)  # pylint: disable=protected-access
+    return [
+        (time(minute // 60, minute % 60).isoformat("minutes"), price)
+        for minute, price in zip(starts, prices)
+    ]
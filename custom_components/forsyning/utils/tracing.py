@@ -0,0 +1,127 @@
+"""Lightweight tracing spans, exportable as a Chrome trace.
+
+When tracing is disabled, span() hands out a shared no-op context manager,
+so instrumented code pays for little more than an attribute lookup. While
+enabled, only the newest MAX_EVENTS spans are kept, so a trace that is
+never stopped can't grow without bounds.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+from collections import deque
+from time import perf_counter_ns
+
+
+class _NoopSpan:
+    """Span used when tracing is disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> bool:
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+MAX_EVENTS = 100_000
+
+
+def _track_id() -> int:
+    """Return an id grouping spans from the same task or thread."""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+
+    return id(task) if task is not None else threading.get_ident()
+
+
+class _Span:
+    """A timed span recorded when the context exits."""
+
+    __slots__ = ("_tracer", "_name", "_args", "_start", "_tid")
+
+    def __init__(self, tracer: Tracer, name: str, args: dict) -> None:
+        self._tracer = tracer
+        self._name = name
+        self._args = args
+        self._start = None
+        self._tid = None
+
+    def __enter__(self):
+        self._tid = _track_id()
+        self._start = perf_counter_ns()
+        return self
+
+    def __exit__(self, *args) -> bool:
+        duration = perf_counter_ns() - self._start
+        self._tracer.record(self._name, self._start, duration, self._tid, self._args)
+        return False
+
+
+class Tracer:
+    """Collect spans while enabled."""
+
+    def __init__(self, max_events: int = MAX_EVENTS) -> None:
+        """Initialize tracer."""
+        self.enabled = False
+        # Number of oldest spans discarded to stay within max_events
+        self.dropped = 0
+        self._events = deque(maxlen=max_events)
+        self._lock = threading.Lock()
+
+    def span(self, name: str, **args):
+        """Return a context manager timing the wrapped block."""
+        if not self.enabled:
+            return NOOP_SPAN
+
+        return _Span(self, name, args)
+
+    def record(
+        self, name: str, start_ns: int, duration_ns: int, tid: int, args: dict
+    ) -> None:
+        """Record a finished span."""
+        event = {
+            "name": name,
+            "ph": "X",
+            "ts": start_ns / 1000,
+            "dur": duration_ns / 1000,
+            "pid": os.getpid(),
+            "tid": tid,
+        }
+        if args:
+            event["args"] = {key: str(value) for key, value in args.items()}
+
+        with self._lock:
+            if len(self._events) == self._events.maxlen:
+                self.dropped += 1
+            self._events.append(event)
+
+    def start(self) -> None:
+        """Start collecting spans, discarding earlier ones."""
+        with self._lock:
+            self._events.clear()
+            self.dropped = 0
+        self.enabled = True
+
+    def stop(self) -> list:
+        """Stop collecting spans and return them."""
+        self.enabled = False
+        with self._lock:
+            events = list(self._events)
+            self._events.clear()
+
+        return events
+
+    @staticmethod
+    def export(events: list, path: str) -> None:
+        """Write spans as a Chrome trace (chrome://tracing, Perfetto)."""
+        with open(path, "w", encoding="UTF-8") as tracefile:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, tracefile)
+
+
+TRACER = Tracer()
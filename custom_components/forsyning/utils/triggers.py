@@ -0,0 +1,148 @@
+"""Price triggers evaluated once per interval against the entry dataset."""
+from __future__ import annotations
+
+from datetime import datetime
+
+from homeassistant.core import HomeAssistant, callback
+
+from ..const import DATA_TRIGGERS, DOMAIN
+
+TRIGGER_CHEAPEST = "cheapest_hours"
+TRIGGER_PRICE_ABOVE = "price_above"
+TRIGGER_PRICE_BELOW = "price_below"
+TRIGGER_WINDOW_START = "cheapest_window_start"
+TRIGGER_TYPES = [
+    TRIGGER_PRICE_ABOVE,
+    TRIGGER_PRICE_BELOW,
+    TRIGGER_CHEAPEST,
+    TRIGGER_WINDOW_START,
+]
+
+
+def cheapest_window(prices: list, length: int) -> int | None:
+    """Return start index of the cheapest run of `length` consecutive prices."""
+    if length <= 0 or length > len(prices):
+        return None
+
+    total = sum(prices[:length])
+    best, best_start = total, 0
+    for start in range(1, len(prices) - length + 1):
+        total += prices[start + length - 1] - prices[start - 1]
+        if total < best:
+            best, best_start = total, start
+
+    return best_start
+
+
+class PriceTriggers:
+    """Registered price triggers for a single entry.
+
+    Rankings and windows are computed once per dataset, and the triggers are
+    evaluated at most once per interval.
+    """
+
+    def __init__(self) -> None:
+        """Initialize registry."""
+        self._triggers = {}
+        self._next_id = 0
+        self._dataset = None
+        self._ranks = []
+        self._windows = {}
+        self._last_evaluated = None
+
+    def __len__(self) -> int:
+        """Return number of registered triggers."""
+        return len(self._triggers)
+
+    def add(self, trigger_type: str, value: float, action):
+        """Register a trigger, returns a callable removing it again."""
+        trigger_id = self._next_id
+        self._next_id += 1
+        self._triggers[trigger_id] = (trigger_type, value, action)
+
+        def remove() -> None:
+            self._triggers.pop(trigger_id, None)
+
+        return remove
+
+    def _prepare(self, dataset: list) -> None:
+        """Precompute rankings for a new dataset."""
+        if dataset is self._dataset:
+            return
+
+        self._dataset = dataset
+        order = sorted(range(len(dataset)), key=lambda index: dataset[index].price)
+        self._ranks = [0] * len(dataset)
+        for rank, index in enumerate(order):
+            self._ranks[index] = rank
+        self._windows = {}
+
+    def _window_start(self, length: int) -> int | None:
+        """Return (cached) start index of the cheapest window."""
+        if length not in self._windows:
+            self._windows[length] = cheapest_window(
+                [interval.price for interval in self._dataset], length
+            )
+
+        return self._windows[length]
+
+    def _matches(self, trigger_type: str, value: float, index: int) -> bool:
+        """Check a single trigger against the interval at index."""
+        price = self._dataset[index].price
+        if trigger_type == TRIGGER_PRICE_ABOVE:
+            return price > value
+        if trigger_type == TRIGGER_PRICE_BELOW:
+            return price < value
+        if trigger_type == TRIGGER_CHEAPEST:
+            return self._ranks[index] < value
+        if trigger_type == TRIGGER_WINDOW_START:
+            return self._window_start(int(value)) == index
+
+        return False
+
+    def evaluate(self, dataset: list | None, current: datetime) -> int:
+        """Fire triggers matching the current interval, returns number fired."""
+        if not self._triggers or not dataset:
+            return 0
+
+        self._prepare(dataset)
+        if current == self._last_evaluated:
+            return 0
+
+        index = next(
+            (pos for pos, interval in enumerate(dataset) if interval.hour == current),
+            None,
+        )
+        if index is None:
+            return 0
+
+        self._last_evaluated = current
+        interval = dataset[index]
+        fired = 0
+        for trigger_type, value, action in list(self._triggers.values()):
+            if self._matches(trigger_type, value, index):
+                action(
+                    {
+                        "type": trigger_type,
+                        "hour": interval.hour,
+                        "price": interval.price,
+                        "rank": self._ranks[index],
+                    }
+                )
+                fired += 1
+
+        return fired
+
+
+@callback
+def async_get_price_triggers(hass: HomeAssistant, entry_id: str) -> PriceTriggers:
+    """Get the trigger registry of an entry.
+
+    The registry lives outside the APIConnector, so attached automations
+    keep firing when the entry is reloaded.
+    """
+    registries = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_TRIGGERS, {})
+    if entry_id not in registries:
+        registries[entry_id] = PriceTriggers()
+
+    return registries[entry_id]
@@ -0,0 +1,102 @@
+"""Websocket API for Forsyning, pushing price updates as compact deltas."""
+from __future__ import annotations
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import DOMAIN, UPDATE_SIGNAL, WS_SUBSCRIBE
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the websocket commands."""
+    websocket_api.async_register_command(hass, ws_subscribe)
+
+
+def build_delta(old: dict, new: dict) -> dict:
+    """Build the changes needed to turn one snapshot into another.
+
+    Keys whose value changed are sent in "set", except lists of equal length
+    which are sent in "patch" as [index, value] pairs for the changed items.
+    """
+    changed = {}
+    patched = {}
+
+    for key, value in new.items():
+        previous = old.get(key)
+        if previous == value:
+            continue
+
+        if (
+            isinstance(value, list)
+            and isinstance(previous, list)
+            and len(value) == len(previous)
+        ):
+            patched[key] = [
+                [index, item]
+                for index, (item, before) in enumerate(zip(value, previous))
+                if item != before
+            ]
+        else:
+            changed[key] = value
+
+    for key in old:
+        if key not in new:
+            changed[key] = None
+
+    delta = {}
+    if changed:
+        delta["set"] = changed
+    if patched:
+        delta["patch"] = patched
+
+    return delta
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_SUBSCRIBE,
+        vol.Required("entry_id"): str,
+    }
+)
+@callback
+def ws_subscribe(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Subscribe to price updates for a config entry."""
+    entry_id = msg["entry_id"]
+    api = hass.data.get(DOMAIN, {}).get(entry_id)
+    if api is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, f"Unknown entry {entry_id}"
+        )
+        return
+
+    last = api.snapshot
+
+    @callback
+    def forward(snapshot: dict) -> None:
+        """Send the changes since the last message to the client."""
+        nonlocal last
+        if last is None:
+            message = {"type": "snapshot", "data": snapshot}
+        else:
+            delta = build_delta(last, snapshot)
+            if not delta:
+                return
+            message = {"type": "delta", **delta}
+
+        last = snapshot
+        connection.send_message(websocket_api.event_message(msg["id"], message))
+
+    connection.subscriptions[msg["id"]] = async_dispatcher_connect(
+        hass, UPDATE_SIGNAL.format(entry_id), forward
+    )
+    connection.send_result(msg["id"])
+
+    if last is not None:
+        connection.send_message(
+            websocket_api.event_message(msg["id"], {"type": "snapshot", "data": last})
+        )
@@ -0,0 +1,65 @@
+"""Export a Forsyning history store without running Home Assistant.
+
+Usage:
+    python scripts/export_history.py --store <config>/forsyning_history/<entry_id>
+        --start 2024-01-01 --end 2024-12-31 --format csv.gz --output prices.csv.gz
+"""
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, time
+
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "..",
+        "custom_components",
+        "forsyning",
+        "utils",
+    ),
+)
+
+# pylint: disable=wrong-import-position
+from export import FORMATS, export_series  # noqa: E402
+from history import HistoryStore  # noqa: E402
+
+
+def main():
+    """Run the export."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--store", required=True, help="Path to the history store")
+    parser.add_argument("--start", required=True, help="First date, YYYY-MM-DD")
+    parser.add_argument("--end", required=True, help="Last date, YYYY-MM-DD")
+    parser.add_argument("--format", default=FORMATS[0], choices=FORMATS)
+    parser.add_argument("--output", required=True, help="File to write")
+    parser.add_argument(
+        "--metadata",
+        default="{}",
+        help="JSON object with metadata, overriding what is stored with the data",
+    )
+    args = parser.parse_args()
+
+    start = datetime.combine(datetime.fromisoformat(args.start).date(), time.min)
+    end = datetime.combine(datetime.fromisoformat(args.end).date(), time.max)
+
+    store = HistoryStore(args.store)
+    metadata = store.read_metadata()
+    metadata.update(json.loads(args.metadata))
+    if "unit" not in metadata:
+        print("Warning: no metadata stored with the data, unit and currency unknown")
+
+    rows = export_series(
+        store,
+        int(start.astimezone().timestamp()),
+        int(end.astimezone().timestamp()) + 1,
+        args.output,
+        args.format,
+        metadata,
+    )
+    print(f"Exported {rows} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
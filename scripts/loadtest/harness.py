@@ -0,0 +1,270 @@
+"""Fleet scale load test of APIConnector against the upstream simulator.
+
+Runs a bare Home Assistant core with 1-500 APIConnector instances, all served
+by a connector module that reads from the simulator. Every round, each
+entry is refreshed by several concurrent callers (like the sensors and the
+services do), so single-flight, normalization, history writes and the
+integration's own retry scheduling are all exercised. The numeric price
+calculation used by the sensors is run on every refreshed day.
+
+Reports request counts, retries, single-flight hit rate, refresh latency
+percentiles and how long the event loop was blocked.
+
+Requires Home Assistant to be installed. Names the integration uses but
+doesn't define yet are filled in by scripts/tree_stubs.py.
+
+Usage:
+    python scripts/loadtest/harness.py --entries 200 --rounds 3 \\
+        --error-rate 0.05 --drop-rate 0.02
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import types
+from collections import Counter, namedtuple
+from datetime import date, datetime, timedelta, timezone
+from time import perf_counter
+
+from aiohttp import ClientError, ServerDisconnectedError
+from homeassistant.core import HomeAssistant
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(HERE, ".."))
+sys.path.insert(0, os.path.join(HERE, "..", ".."))
+
+# pylint: disable=wrong-import-position
+import tree_stubs  # noqa: E402
+from simulator import add_arguments, from_arguments, start_simulator  # noqa: E402
+
+tree_stubs.install_const()
+
+import custom_components.forsyning as forsyning  # noqa: E402
+from custom_components.forsyning import connectors  # noqa: E402
+from custom_components.forsyning.utils.calculation import (  # noqa: E402
+    PriceSpec,
+    calculate_series,
+)
+
+tree_stubs.install_package(forsyning)
+
+CONNECTOR = "simulator"
+REGIONS = ["DK1", "DK2"]
+
+# Price settings of a typical sensor: kWh, 25% VAT, no template
+PRICE_SPEC = PriceSpec(
+    vat=0.25,
+    divisor=1000,
+    in_mwh=False,
+    cent_multiplier=1,
+    decimals=3,
+    addition=0.0,
+    tariff=None,
+    tz="UTC",
+)
+
+
+class LoopMonitor:
+    """Measure how long the event loop is blocked."""
+
+    def __init__(self, interval: float = 0.01, threshold: float = 0.005) -> None:
+        """Initialize monitor."""
+        self.interval = interval
+        self.threshold = threshold
+        self.blocked = 0.0
+        self.worst = 0.0
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            start = perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = perf_counter() - start - self.interval
+            if lag > self.threshold:
+                self.blocked += lag
+                self.worst = max(self.worst, lag)
+
+    def start(self) -> None:
+        """Start monitoring."""
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self) -> None:
+        """Stop monitoring."""
+        self._task.cancel()
+
+
+def simulator_connector(url: str, stats: Counter) -> types.ModuleType:
+    """Build a connector module fetching from the simulator."""
+    module = types.ModuleType(f"{forsyning.__name__}.connectors.{CONNECTOR}")
+    Interval = namedtuple("Interval", "price hour")
+
+    class Connector:
+        """Connector reading from the simulator."""
+
+        def __init__(self, region, client, tz) -> None:
+            """Initialize connector."""
+            self._region = region
+            self._client = client
+            self.today = None
+            self.tomorrow = None
+
+        async def _fetch(self, day: date) -> list | None:
+            stats["requests"] += 1
+            try:
+                async with self._client.get(
+                    url, params={"region": self._region.region, "date": str(day)}
+                ) as resp:
+                    resp.raise_for_status()
+                    data = await resp.json()
+            except ServerDisconnectedError:
+                stats["disconnects"] += 1
+                raise
+            except ClientError:
+                # Like the real connectors, errors other than a dropped
+                # connection just leave the day without data
+                stats["failed"] += 1
+                return None
+
+            return [
+                Interval(item["price"], datetime.fromisoformat(item["hour"]))
+                for item in data
+            ]
+
+        async def async_get_spotprices(self) -> None:
+            """Fetch today and tomorrow."""
+            today = datetime.now(timezone.utc).date()
+            self.today = await self._fetch(today)
+            self.tomorrow = await self._fetch(today + timedelta(days=1))
+
+    module.Connector = Connector
+    module.SOURCE_NAME = "Simulator"
+    return module
+
+
+def install_connector(module: types.ModuleType) -> None:
+    """Make the simulator connector the only one APIConnector can find."""
+    sys.modules[module.__name__] = module
+    # pylint: disable=protected-access
+    connectors._DISCOVERED = [
+        connectors.Connector(
+            CONNECTOR, f".connectors.{CONNECTOR}", REGIONS, module.SOURCE_NAME
+        )
+    ]
+
+
+def percentile(values: list, pct: float) -> float | None:
+    """Return the given percentile of a list of values."""
+    if not values:
+        return None
+
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+async def run(args) -> dict:
+    """Run the load test."""
+    simulator = from_arguments(args)
+    runner = await start_simulator(simulator, port=args.port)
+    stats = Counter()
+    install_connector(
+        simulator_connector(f"http://127.0.0.1:{args.port}/prices", stats)
+    )
+
+    # Retry delays are configured in minutes
+    forsyning.RETRY_MINUTES = args.retry_delay / 60
+    forsyning.MAX_RETRY_MINUTES = args.max_retry_delay / 60
+
+    config_dir = tempfile.mkdtemp(prefix="forsyning_loadtest_")
+    hass = HomeAssistant(config_dir)
+    hass.config.time_zone = "UTC"
+
+    latencies = []
+    limit = asyncio.Semaphore(args.concurrency)
+    monitor = LoopMonitor()
+    monitor.start()
+
+    async def _refresh(api) -> None:
+        async with limit:
+            start = perf_counter()
+            results = await asyncio.gather(
+                *(api.update() for _ in range(args.callers)), return_exceptions=True
+            )
+            if not api.today or any(
+                isinstance(result, Exception) for result in results
+            ):
+                stats["failed_updates"] += 1
+                return
+            for day in (api.today, api.tomorrow):
+                if day:
+                    calculate_series(
+                        PRICE_SPEC,
+                        [(int(i.hour.timestamp()), i.price) for i in day],
+                    )
+            latencies.append(perf_counter() - start)
+
+    try:
+        entries = [
+            forsyning.APIConnector(
+                hass,
+                REGIONS[index % len(REGIONS)],
+                f"loadtest_{index}",
+                resolution=args.resolution,
+            )
+            for index in range(args.entries)
+        ]
+        _start = perf_counter()
+        for _ in range(args.rounds):
+            await asyncio.gather(*(_refresh(api) for api in entries))
+        wall = perf_counter() - _start
+
+        # Let retries scheduled by the integration run
+        await asyncio.sleep(args.settle)
+    finally:
+        monitor.stop()
+        await hass.async_stop(force=True)
+        await runner.cleanup()
+
+    hits = [api.metrics.hit_rate("update") for api in entries]
+    return {
+        "entries": args.entries,
+        "rounds": args.rounds,
+        "callers": args.callers,
+        "wall_time": round(wall, 3),
+        "client": dict(stats),
+        "upstream": dict(simulator.stats),
+        "retries_pending": sum(api.retry_count for api in entries),
+        "single_flight_hits": round(
+            sum(hit for hit in hits if hit is not None) / len(hits), 4
+        ),
+        "gaps": sum(1 for api in entries for gaps in api.gaps.values() if gaps),
+        "refresh_p50": percentile(latencies, 50),
+        "refresh_p99": percentile(latencies, 99),
+        "loop_blocked_total": round(monitor.blocked, 4),
+        "loop_blocked_worst": round(monitor.worst, 4),
+    }
+
+
+def main():
+    """Parse arguments and print the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=10, choices=range(1, 501))
+    parser.add_argument("--rounds", type=int, default=1)
+    parser.add_argument("--callers", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--retry-delay", type=float, default=0.5)
+    parser.add_argument("--max-retry-delay", type=float, default=5.0)
+    parser.add_argument("--settle", type=float, default=0.0)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    for key, value in asyncio.run(run(args)).items():
+        print(f"{key:>20}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Local stand-in for the upstream price/meter endpoints.
+
+Serves GET /prices?region=<region>&date=<YYYY-MM-DD> with a JSON list of
+{"hour": <iso>, "price": <float>} intervals and can be told to misbehave:
+added latency, data for tomorrow only being published after a given hour,
+5xx errors and dropped connections (seen as ServerDisconnectedError by the
+client, like the error path in APIConnector.update).
+
+Usage:
+    python scripts/loadtest/simulator.py --port 8099 --latency 0.2 \\
+        --error-rate 0.05 --drop-rate 0.02 --publish-hour 13
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import zlib
+from collections import Counter
+from datetime import date, datetime, time, timedelta, timezone
+
+from aiohttp import web
+
+
+class UpstreamSimulator:
+    """Configurable fake upstream."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        drop_rate: float = 0.0,
+        publish_hour: int = 13,
+        resolution: int = 60,
+        seed: int | None = None,
+    ) -> None:
+        """Initialize simulator."""
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.publish_hour = publish_hour
+        self.resolution = resolution
+        self.stats = Counter()
+        self._random = random.Random(seed)
+
+    def app(self) -> web.Application:
+        """Return the aiohttp application."""
+        app = web.Application()
+        app.router.add_get("/prices", self.handle_prices)
+        app.router.add_get("/stats", self.handle_stats)
+        return app
+
+    def _series(self, region: str, day: date) -> list:
+        """Build a deterministic series for a region and day."""
+        start = datetime.combine(day, time.min, tzinfo=timezone.utc)
+        # crc32 is stable between runs, unlike hash()
+        seed = zlib.crc32(f"{region}/{day.isoformat()}".encode())
+        return [
+            {
+                "hour": (start + timedelta(minutes=offset)).isoformat(),
+                "price": round(50 + 40 * ((seed >> (offset % 32)) & 7) / 7, 2),
+            }
+            for offset in range(0, 24 * 60, self.resolution)
+        ]
+
+    async def handle_prices(self, request: web.Request) -> web.StreamResponse:
+        """Serve a days worth of intervals."""
+        self.stats["requests"] += 1
+        delay = max(0.0, self._random.gauss(self.latency, self.jitter))
+        if delay:
+            await asyncio.sleep(delay)
+
+        roll = self._random.random()
+        if roll < self.drop_rate:
+            self.stats["dropped"] += 1
+            request.transport.close()
+            return web.Response()
+
+        if roll < self.drop_rate + self.error_rate:
+            self.stats["errors"] += 1
+            raise web.HTTPServiceUnavailable()
+
+        region = request.query.get("region", "DK1")
+        day = date.fromisoformat(request.query.get("date", date.today().isoformat()))
+        now = datetime.now()
+        if day > now.date() and now.hour < self.publish_hour:
+            self.stats["not_published"] += 1
+            return web.json_response([])
+
+        self.stats["ok"] += 1
+        return web.json_response(self._series(region, day))
+
+    async def handle_stats(
+        self, request: web.Request
+    ) -> web.Response:  # pylint: disable=unused-argument
+        """Return request counters."""
+        return web.json_response(dict(self.stats))
+
+
+async def start_simulator(
+    simulator: UpstreamSimulator, host: str = "127.0.0.1", port: int = 8099
+) -> web.AppRunner:
+    """Start the simulator, returns the runner so it can be cleaned up."""
+    runner = web.AppRunner(simulator.app())
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add simulator arguments to a parser."""
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--publish-hour", type=int, default=13)
+    parser.add_argument("--resolution", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def from_arguments(args: argparse.Namespace) -> UpstreamSimulator:
+    """Create a simulator from parsed arguments."""
+    return UpstreamSimulator(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        drop_rate=args.drop_rate,
+        publish_hour=args.publish_hour,
+        resolution=args.resolution,
+        seed=args.seed,
+    )
+
+
+def main():
+    """Run the simulator until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    web.run_app(from_arguments(args).app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()